@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from ansible import constants as C
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+
+try:
+    from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+
+    HAS_ARGSPEC_VALIDATOR = True
+except ImportError:
+    HAS_ARGSPEC_VALIDATOR = False
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    ConnectionPool,
+    Ping,
+)
+
+display = Display()
+
+# Connections kept open by this worker process, keyed by (timeout, validate_certs),
+# so the items of a loop skip the TCP and TLS setup. Ansible starts a new worker
+# for every host and task, nothing is shared beyond the items of a loop.
+_POOLS = {}
+
+
+def _valid_args(argument_spec):
+    # ActionBase checks the task options against these names, aliases included
+    names = set()
+    for name, spec in argument_spec.items():
+        names.add(name)
+        names.update(spec.get("aliases") or [])
+    return frozenset(names)
+
+
+class _ModuleExit(Exception):
+    def __init__(self, result):
+        super(_ModuleExit, self).__init__(result.get("msg"))
+        self.result = result
+
+
+class _ControllerModule(object):
+    """The parts of AnsibleModule used by the module_utils, run on the controller."""
+
+    def __init__(self, params, check_mode):
+        self.params = params
+        self.check_mode = check_mode
+        self.tmpdir = C.DEFAULT_LOCAL_TMP
+        key = (params.get("timeout", 30), params.get("validate_certs", True))
+        if key not in _POOLS:
+            _POOLS[key] = ConnectionPool(timeout=key[0], validate_certs=key[1])
+        self.connection_pool = _POOLS[key]
+
+    def jsonify(self, data):
+        return json.dumps(data)
+
+    def debug(self, msg):
+        display.vvv(msg)
+
+    def exit_json(self, **kwargs):
+        kwargs.setdefault("changed", False)
+        raise _ModuleExit(kwargs)
+
+    def fail_json(self, msg, **kwargs):
+        kwargs.update(failed=True, msg=msg)
+        raise _ModuleExit(kwargs)
+
+
+class ActionModule(ActionBase):
+    _VALID_ARGS = _valid_args(Ping.argument_spec())
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        if (
+            not HAS_ARGSPEC_VALIDATOR
+            or self._task.args.get("ping_from", "controller") == "target"
+        ):
+            result.update(self._execute_module(task_vars=task_vars))
+            return result
+
+        validation = ArgumentSpecValidator(
+            Ping.argument_spec(),
+            mutually_exclusive=Ping.MUTUALLY_EXCLUSIVE,
+            required_one_of=Ping.REQUIRED_ONE_OF,
+        ).validate(self._task.args)
+        if validation.error_messages:
+            result.update(
+                failed=True,
+                msg="Invalid arguments: {0}".format(
+                    ", ".join(validation.error_messages)
+                ),
+            )
+            return result
+
+        module = _ControllerModule(
+            validation.validated_parameters, self._task.check_mode
+        )
+        try:
+            Ping(module).run()
+        except _ModuleExit as e:
+            result.update(e.result)
+        except Exception as e:
+            result.update(
+                failed=True,
+                msg="Failed to send the signals: {0}".format(to_native(e)),
+            )
+        return result
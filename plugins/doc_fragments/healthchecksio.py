@@ -46,4 +46,120 @@ options:
       - C(HEALTHCHECKSIO_API_PING_KEY), C(HC_API_PING_KEY)
     type: str
     required: false
+  token_validation:
+    description:
+      - How the management API token is validated.
+      - C(lazy) reports a C(401) on the first management API request as a login failure.
+      - C(probe) sends one small request before doing any work, so a bad token fails even in check mode.
+      - C(none) skips the validation, a C(401) is reported like any other failed request.
+      - Ping API requests never validate the token.
+    type: str
+    choices: ["lazy", "probe", "none"]
+    default: lazy
+    required: false
+    version_added: 1.6.0
+  keep_alive:
+    description:
+      - Reuse one HTTP connection per host for all the requests sent by the module,
+        instead of opening a new connection (and TLS session) for every request.
+      - Requests that have to go through a proxy always use a new connection.
+      - The number of opened and reused connections is returned in C(api_stats).
+    type: bool
+    default: false
+    required: false
+    version_added: 1.6.0
+  retries:
+    description:
+      - Number of times a request is sent again after a C(429) answer, a connection error,
+        or a C(500), C(502), C(503), or C(504) answer.
+      - Throttled requests are always sent again. After a connection error or a server error,
+        only requests that are safe to repeat are sent again, that is C(GET), C(HEAD), C(PUT),
+        and C(DELETE) requests, check updates, checks created with C(unique), pauses, and pings.
+      - The number of retries and the total time spent waiting are returned in C(api_stats),
+        as C(retries) and C(backoff_seconds).
+      - C(0) sends every request once.
+    type: int
+    default: 0
+    required: false
+    version_added: 1.6.0
+  retry_delay:
+    description:
+      - Number of seconds to wait before the first retry, doubled for every following retry.
+      - A C(Retry-After) header sent by the server is followed instead.
+    type: float
+    default: 1.0
+    required: false
+    version_added: 1.6.0
+  retry_max_delay:
+    description:
+      - Maximum number of seconds to wait before a retry.
+      - When the C(Retry-After) header of the server asks to wait longer, the request is not retried.
+    type: float
+    default: 60.0
+    required: false
+    version_added: 1.6.0
+  retry_jitter:
+    description:
+      - Fraction of the delay, between C(0) and C(1), that is randomly removed from each wait,
+        so concurrent requests do not retry all at once.
+    type: float
+    default: 0.5
+    required: false
+    version_added: 1.6.0
+  rate_limit:
+    description:
+      - Maximum number of requests per second sent with the same API token by all the processes
+        of the host the module runs on, for example the forks of a play delegated to C(localhost).
+      - Requests over the limit wait for their turn instead of being throttled by the server.
+      - The time spent waiting is returned in C(api_stats) as C(rate_limit_wait_seconds).
+      - C(0) disables the limit.
+    type: float
+    default: 0.0
+    required: false
+    version_added: 1.6.0
+  rate_limit_burst:
+    description:
+      - Number of requests that can be sent at once, without waiting, after a quiet period.
+    type: int
+    default: 1
+    required: false
+    version_added: 1.6.0
+  rate_limit_dir:
+    description:
+      - Directory of the file shared by the processes to enforce C(rate_limit).
+      - Defaults to the temporary directory of the system.
+    type: path
+    required: false
+    version_added: 1.6.0
+  cache_ttl:
+    description:
+      - Number of seconds the answers of read requests to the management API are reused, by all the
+        processes of the host the module runs on, instead of being fetched again.
+      - Any check created, updated, paused or deleted through the management API empties the cache.
+      - Changes made outside of the modules, for example in the web interface, show up after at most C(cache_ttl) seconds.
+      - Older answers sent with an C(ETag) or C(Last-Modified) header are revalidated with a conditional request,
+        and reused without being downloaded again when the server answers that they did not change.
+      - The number of answers reused and fetched is returned in C(api_stats) as C(cache_hits) and C(cache_misses),
+        the answers reused after a revalidation as C(cache_revalidations).
+      - Listings that are streamed to bound the memory used, such as the checks and pings listings of the info
+        modules and their exports, are not cached.
+      - C(0) disables the cache.
+    type: int
+    default: 0
+    required: false
+    version_added: 1.6.0
+  cache_max_size:
+    description:
+      - Maximum size of the cache, in bytes, the least recently used answers are removed first.
+    type: int
+    default: 10485760
+    required: false
+    version_added: 1.6.0
+  cache_dir:
+    description:
+      - Directory the cache is kept in, readable only by the user running the module.
+      - Defaults to the temporary directory of the system.
+    type: path
+    required: false
+    version_added: 1.6.0
 """
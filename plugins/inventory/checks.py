@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+name: checks
+short_description: Healthchecks.io checks inventory source
+description:
+  - Builds an inventory with one host per Healthchecks.io check.
+  - Hosts are grouped by the tags of their check (C(tag_<tag>)) and by the status of
+    their check (C(status_up), C(status_down), C(status_grace), C(status_paused), ...).
+  - The checks list is parsed as a stream, one check at a time.
+  - Uses a YAML configuration file that ends with C(healthchecksio.yml) or C(healthchecksio.yaml).
+author: "Mark Mercado (@mamercad)"
+version_added: 1.6.0
+extends_documentation_fragment:
+  - constructed
+  - inventory_cache
+options:
+  plugin:
+    description:
+      - The name of this plugin, it should always be set to C(community.healthchecksio.checks).
+    type: str
+    required: true
+    choices: ["community.healthchecksio.checks"]
+  management_api_token:
+    description:
+      - Healthchecks.io management API token, a read-only token is enough.
+    type: str
+    required: true
+    aliases: ["management_api_key", "api_key"]
+    env:
+      - name: HEALTHCHECKSIO_API_TOKEN
+      - name: HEALTHCHECKSIO_API_KEY
+      - name: HC_API_TOKEN
+      - name: HC_API_KEY
+  management_api_base_url:
+    description:
+      - Base URL of the Healthchecks.io management API.
+    type: str
+    default: https://healthchecks.io/api/v1
+    env:
+      - name: HEALTHCHECKSIO_API_MANAGEMENT_BASE_URL
+      - name: HC_API_MANAGEMENT_BASE_URL
+  tags:
+    description:
+      - Only add the checks that are tagged with all of these tags.
+    type: list
+    elements: str
+    default: []
+  hostname:
+    description:
+      - Field of the check used as the inventory hostname.
+      - Checks with an empty value for this field are skipped.
+    type: str
+    choices: ["name", "slug", "uuid"]
+    default: name
+  variable_prefix:
+    description:
+      - Prefix of the host variables holding the fields of the check.
+    type: str
+    default: healthchecksio_
+  timeout:
+    description:
+      - Timeout of the request to the management API, in seconds.
+    type: int
+    default: 30
+  validate_certs:
+    description:
+      - Whether to validate the TLS certificate of the management API.
+    type: bool
+    default: true
+"""
+
+EXAMPLES = r"""
+# healthchecksio.yml
+plugin: community.healthchecksio.checks
+hostname: name
+tags:
+  - backup
+cache: true
+cache_timeout: 600
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/healthchecksio
+
+# Then, in a playbook:
+# - hosts: status_down
+#   tasks: ...
+"""
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    iter_checks,
+)
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = "community.healthchecksio.checks"
+
+    def verify_file(self, path):
+        if super(InventoryModule, self).verify_file(path):
+            return path.endswith(("healthchecksio.yml", "healthchecksio.yaml"))
+        return False
+
+    def _fetch_checks(self):
+        try:
+            return list(
+                iter_checks(
+                    self.get_option("management_api_base_url"),
+                    self.get_option("management_api_token"),
+                    tags=self.get_option("tags"),
+                    timeout=self.get_option("timeout"),
+                    validate_certs=self.get_option("validate_certs"),
+                )
+            )
+        except Exception as e:
+            raise AnsibleError(
+                "Failed to get the Healthchecks.io checks: {0}".format(to_native(e))
+            )
+
+    def _populate(self, checks):
+        prefix = self.get_option("variable_prefix")
+        strict = self.get_option("strict")
+        hostname_field = self.get_option("hostname")
+
+        for check in checks:
+            hostname = check.get(hostname_field)
+            if not hostname:
+                continue
+
+            self.inventory.add_host(hostname)
+            hostvars = {}
+            for key, value in check.items():
+                hostvars[prefix + key] = value
+                self.inventory.set_variable(hostname, prefix + key, value)
+
+            groups = ["status_" + (check.get("status") or "unknown")]
+            groups.extend("tag_" + tag for tag in (check.get("tags") or "").split())
+            for group in groups:
+                group = self.inventory.add_group(self._sanitize_group_name(group))
+                self.inventory.add_child(group, hostname)
+
+            self._set_composite_vars(
+                self.get_option("compose"), hostvars, hostname, strict=strict
+            )
+            self._add_host_to_composed_groups(
+                self.get_option("groups"), hostvars, hostname, strict=strict
+            )
+            self._add_host_to_keyed_groups(
+                self.get_option("keyed_groups"), hostvars, hostname, strict=strict
+            )
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option("cache")
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        checks = None
+        if attempt_to_read_cache:
+            try:
+                checks = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        if checks is None:
+            checks = self._fetch_checks()
+
+        if cache_needs_update:
+            self._cache[cache_key] = checks
+
+        self._populate(checks)
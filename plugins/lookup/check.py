@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+name: check
+short_description: Look up checks by name, slug, tag, or uuid
+description:
+  - Returns the uuid, the ping URL, or the whole record of the checks matching the given terms.
+  - The checks list is fetched once and memoized for the whole C(ansible-playbook) run,
+    so looking up checks for many hosts costs a single API request per C(cache_ttl) window.
+  - The memoized list is shared by the forks of the run through a file in the controller
+    temporary directory, it is removed when the run ends.
+author: "Mark Mercado (@mamercad)"
+version_added: 1.6.0
+options:
+  _terms:
+    description:
+      - Names, slugs, tags, or uuids of the checks, depending on C(key).
+    type: list
+    elements: str
+    required: true
+  key:
+    description:
+      - Field of the checks the terms are matched against.
+      - A C(name), C(slug), or C(uuid) term must match exactly one check, a C(tag) term
+        returns every check with that tag.
+    type: str
+    choices: ["name", "slug", "tag", "uuid"]
+    default: name
+  output:
+    description:
+      - What to return for each matching check.
+    type: str
+    choices: ["uuid", "ping_url", "record"]
+    default: uuid
+  management_api_token:
+    description:
+      - Healthchecks.io management API token.
+    type: str
+    required: true
+    aliases: ["management_api_key", "api_key"]
+    env:
+      - name: HEALTHCHECKSIO_API_TOKEN
+      - name: HEALTHCHECKSIO_API_KEY
+      - name: HC_API_TOKEN
+      - name: HC_API_KEY
+  management_api_base_url:
+    description:
+      - Base URL of the Healthchecks.io management API.
+    type: str
+    default: https://healthchecks.io/api/v1
+    env:
+      - name: HEALTHCHECKSIO_API_MANAGEMENT_BASE_URL
+      - name: HC_API_MANAGEMENT_BASE_URL
+  cache_ttl:
+    description:
+      - Number of seconds the memoized checks list is used before it is fetched again.
+      - C(0) fetches the checks list on every lookup.
+    type: int
+    default: 300
+  invalidate:
+    description:
+      - Drop the memoized checks list and fetch it again, for example after creating checks.
+    type: bool
+    default: false
+  timeout:
+    description:
+      - Timeout of the request to the management API, in seconds.
+    type: int
+    default: 30
+  validate_certs:
+    description:
+      - Whether to validate the TLS certificate of the management API.
+    type: bool
+    default: true
+"""
+
+EXAMPLES = r"""
+- name: Ping the check named after the host
+  community.healthchecksio.ping:
+    uuid: "{{ lookup('community.healthchecksio.check', inventory_hostname) }}"
+
+- name: Get the ping URLs of all the backup checks
+  ansible.builtin.debug:
+    msg: "{{ lookup('community.healthchecksio.check', 'backup', key='tag', output='ping_url', wantlist=True) }}"
+
+- name: Refresh the memoized checks after creating new ones
+  ansible.builtin.set_fact:
+    check: "{{ lookup('community.healthchecksio.check', 'new-check', key='slug', output='record', invalidate=True) }}"
+"""
+
+RETURN = r"""
+_raw:
+  description:
+    - The uuids, ping URLs, or records of the matching checks.
+  type: list
+  elements: raw
+"""
+
+import hashlib
+import json
+import os
+import time
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+from ansible import constants as C
+from ansible.errors import AnsibleLookupError
+from ansible.module_utils.common.text.converters import to_bytes, to_native
+from ansible.plugins.lookup import LookupBase
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    iter_checks,
+)
+
+# Checks lists memoized in this process, keyed by API URL and token hash
+_MEMO = {}
+
+
+class LookupModule(LookupBase):
+    def _memo_key(self, base_url, api_token):
+        return hashlib.sha256(
+            to_bytes("{0}\n{1}".format(base_url, api_token))
+        ).hexdigest()
+
+    def _memo_path(self, memo_key):
+        # The controller temporary directory is created once per run and
+        # shared by its forks, which is what lets them reuse the list.
+        return os.path.join(C.DEFAULT_LOCAL_TMP, "healthchecksio-checks-" + memo_key)
+
+    def _read_memo_file(self, path, ttl):
+        try:
+            with open(path, "r") as f:
+                memo = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() - memo["fetched_at"] >= ttl:
+            return None
+        return memo
+
+    def _write_memo_file(self, path, memo):
+        tmp_path = "{0}.{1}".format(path, os.getpid())
+        with open(tmp_path, "w") as f:
+            json.dump(memo, f)
+        os.rename(tmp_path, path)
+
+    def _fetch(self, base_url, api_token):
+        try:
+            return list(
+                iter_checks(
+                    base_url,
+                    api_token,
+                    timeout=self.get_option("timeout"),
+                    validate_certs=self.get_option("validate_certs"),
+                )
+            )
+        except Exception as e:
+            raise AnsibleLookupError(
+                "Failed to get the Healthchecks.io checks: {0}".format(to_native(e))
+            )
+
+    def _get_memo(self):
+        base_url = self.get_option("management_api_base_url")
+        api_token = self.get_option("management_api_token")
+        ttl = self.get_option("cache_ttl")
+        memo_key = self._memo_key(base_url, api_token)
+        path = self._memo_path(memo_key)
+
+        if self.get_option("invalidate"):
+            _MEMO.pop(memo_key, None)
+            if os.path.exists(path):
+                os.unlink(path)
+
+        memo = _MEMO.get(memo_key)
+        if memo is not None and time.time() - memo["fetched_at"] < ttl:
+            return memo
+        if ttl <= 0:
+            return dict(fetched_at=time.time(), checks=self._fetch(base_url, api_token))
+
+        lock = None
+        if HAS_FCNTL and os.path.isdir(C.DEFAULT_LOCAL_TMP):
+            # Only one fork fetches, the others wait and read its result
+            lock = open(path + ".lock", "w")
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            memo = self._read_memo_file(path, ttl)
+            if memo is None:
+                memo = dict(
+                    fetched_at=time.time(), checks=self._fetch(base_url, api_token)
+                )
+                if lock is not None:
+                    self._write_memo_file(path, memo)
+        finally:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+                lock.close()
+
+        _MEMO[memo_key] = memo
+        return memo
+
+    def _index(self, memo, key):
+        # Built once per memoized list and key, so every term is a dict lookup
+        indexes = memo.setdefault("indexes", {})
+        if key in indexes:
+            return indexes[key]
+        index = indexes[key] = {}
+        for check in memo["checks"]:
+            if key == "tag":
+                values = (check.get("tags") or "").split()
+            else:
+                values = [check.get(key)]
+            for value in values:
+                index.setdefault(value, []).append(check)
+        return index
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        key = self.get_option("key")
+        output = self.get_option("output")
+        index = self._index(self._get_memo(), key)
+
+        ret = []
+        for term in terms:
+            matches = index.get(term, [])
+            if key != "tag":
+                if len(matches) > 1:
+                    raise AnsibleLookupError(
+                        "Expected to find one check with {0} {1}, {2} found".format(
+                            key, term, len(matches)
+                        )
+                    )
+            if not matches:
+                raise AnsibleLookupError(
+                    "No check found with {0} {1}".format(key, term)
+                )
+            for check in matches:
+                ret.append(check if output == "record" else check.get(output))
+        return ret
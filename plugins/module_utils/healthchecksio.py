@@ -6,26 +6,783 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import calendar
+import codecs
+import collections
+import csv
+import contextlib
+import errno
+import functools
+import hashlib
+import io
 import json
+import os
+import random
+import re
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid as uuidlib
+import zlib
+
+from email.utils import parsedate
 
 try:
-    from urllib.parse import quote
+    from urllib.parse import quote, urlparse
+    from urllib.request import getproxies, proxy_bypass
 except ImportError:
-    from urllib import quote
-from ansible.module_utils.urls import fetch_url
-from ansible.module_utils.common.text.converters import to_text
+    from urllib import quote, getproxies, proxy_bypass
+    from urlparse import urlparse
+
+try:
+    import http.client as http_client
+except ImportError:
+    import httplib as http_client
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+try:
+    import ssl
+
+    HAS_SSL = True
+except ImportError:
+    HAS_SSL = False
+
+try:
+    import resource
+
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+from ansible.module_utils.urls import fetch_url, open_url
+from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.six import PY3, reraise
+
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
+
+# Newer fetch_url decompresses gzip answers by itself, which hides their size
+FETCH_URL_DECOMPRESS = "decompress" in getargspec(fetch_url).args
+
+
+def run_concurrently(func, items, parallelism=1, fail_fast=False, is_failure=None):
+    """Call ``func`` on every item with at most ``parallelism`` calls in flight.
+
+    Results are returned in the order of ``items``. A failing item does not stop
+    the others unless ``fail_fast`` is set, in which case items that have not
+    started yet are skipped and their result is ``None``. An exception raised
+    by ``func`` stops the items that have not started yet, and is raised again
+    from the calling thread once the calls in flight are done.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    pending = iter(enumerate(items))
+    lock = threading.Lock()
+    stopped = []
+    errors = []
+
+    def worker():
+        while True:
+            with lock:
+                if stopped:
+                    return
+                try:
+                    i, item = next(pending)
+                except StopIteration:
+                    return
+            try:
+                results[i] = func(item)
+            except Exception:
+                with lock:
+                    errors.append(sys.exc_info())
+                    stopped.append(i)
+                return
+            if fail_fast and is_failure is not None and is_failure(results[i]):
+                with lock:
+                    stopped.append(i)
+
+    workers = min(max(parallelism, 1), len(items))
+    if workers <= 1:
+        worker()
+        return results
+
+    threads = [threading.Thread(target=worker) for dummy in range(workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        reraise(*errors[0])
+    return results
+
+
+def iter_json_items(fileobj, key=None, chunk_size=65536):
+    """Yield the items of a JSON array read from ``fileobj`` one at a time.
+
+    The array is either the whole document (``key=None``) or the value of
+    ``key`` in the top-level object, e.g. ``{"checks": [...]}``. Only the item
+    being decoded is held in memory, never the whole document.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    state = dict(buf="", pos=0, eof=False)
+
+    def fill():
+        data = fileobj.read(chunk_size)
+        if not data:
+            state["buf"] += utf8.decode(b"", final=True)
+            state["eof"] = True
+            return
+        # Drop what has been consumed so the buffer only holds one item
+        state["buf"] = state["buf"][state["pos"] :] + utf8.decode(data)
+        state["pos"] = 0
+
+    def peek():
+        while True:
+            buf, pos = state["buf"], state["pos"]
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            state["pos"] = pos
+            if pos < len(buf):
+                return buf[pos]
+            if state["eof"]:
+                return ""
+            fill()
+
+    def expect(char):
+        if peek() != char:
+            raise ValueError(
+                "Expected {0!r} at offset {1} of the JSON document".format(
+                    char, state["pos"]
+                )
+            )
+        state["pos"] += 1
+
+    def decode():
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(state["buf"], state["pos"])
+            except ValueError:
+                if state["eof"]:
+                    raise
+                fill()
+                continue
+            # A number at the end of the buffer may continue in the next chunk,
+            # "1." or "1e" is only decoded as far as its integer part
+            buf = state["buf"]
+            cut = end == len(buf) or (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and buf[end] in ".eE+-"
+            )
+            if cut and not state["eof"]:
+                fill()
+                continue
+            state["pos"] = end
+            return value
+
+    if key is not None:
+        expect("{")
+        while True:
+            if peek() == "}":
+                return
+            name = decode()
+            expect(":")
+            if name == key and peek() == "[":
+                break
+            decode()
+            if peek() == ",":
+                state["pos"] += 1
+
+    expect("[")
+    if peek() == "]":
+        return
+    while True:
+        yield decode()
+        if peek() == ",":
+            state["pos"] += 1
+            continue
+        expect("]")
+        return
+
+
+def peak_rss_kb():
+    """Return the peak resident set size of this process in kB, if known."""
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux counts kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        peak //= 1024
+    return peak
+
+
+def parse_timestamp(value):
+    """Return the UNIX time of an ISO 8601 timestamp, as sent by the API.
+
+    For example ``2020-03-23T10:18:23+00:00``, a timestamp without an offset
+    is taken as UTC.
+    """
+    match = re.match(
+        r"(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(\.\d+)?(Z|[+-]\d\d:?\d\d)?$",
+        value.strip(),
+    )
+    if not match:
+        raise ValueError("Invalid timestamp: {0}".format(value))
+    seconds = calendar.timegm(tuple(int(part) for part in match.groups()[:6]))
+    if match.group(7):
+        seconds += float(match.group(7))
+    offset = match.group(8)
+    if offset and offset != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        seconds -= sign * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+    return seconds
+
+
+def summarize_flips(flips, start, end, up):
+    """Summarize the availability of a check between ``start`` and ``end``.
+
+    ``flips`` are ``(timestamp, up)`` pairs sorted by timestamp and ``up`` is
+    the state of the check at ``start``. The flips are walked once, the down
+    intervals come out sorted and clipped to the window.
+    """
+    intervals = []
+    down_since = None if up else start
+    count = 0
+    for timestamp, flip_up in flips:
+        if timestamp < start or timestamp > end:
+            continue
+        count += 1
+        if flip_up and down_since is not None:
+            intervals.append((down_since, timestamp))
+            down_since = None
+        elif not flip_up and down_since is None:
+            down_since = timestamp
+    recovered = len(intervals)
+    if down_since is not None:
+        intervals.append((down_since, end))
+
+    downtime = sum(until - since for since, until in intervals)
+    mttr = None
+    if recovered:
+        mttr = round(
+            sum(until - since for since, until in intervals[:recovered]) / recovered,
+            3,
+        )
+    return dict(
+        uptime_percent=round(100.0 * (end - start - downtime) / (end - start), 3),
+        downtime_seconds=round(downtime, 3),
+        flips=count,
+        outages=len(intervals),
+        mttr_seconds=mttr,
+        down_intervals=[[since, until] for since, until in intervals],
+    )
+
+
+def iter_checks(base_url, api_token, tags=None, timeout=30, validate_certs=True):
+    """Stream the checks list for controller plugins, which have no AnsibleModule.
+
+    Checks listed by API versions that do not return the ``uuid`` field get it
+    from their ping URL. HTTP errors are raised as the exceptions of ``open_url``.
+    """
+    url = "{0}/checks/".format(base_url.rstrip("/"))
+    if tags:
+        url += "?" + "&".join("tag=" + quote(tag, safe="") for tag in tags)
+    resp = open_url(
+        url,
+        headers={"X-Api-Key": api_token},
+        timeout=timeout,
+        validate_certs=validate_certs,
+    )
+    try:
+        for check in iter_json_items(resp, "checks"):
+            if not check.get("uuid") and check.get("ping_url"):
+                check["uuid"] = check["ping_url"].rstrip("/").split("/")[-1]
+            yield check
+    finally:
+        resp.close()
+
+
+class ConnectionPool(object):
+    """Keep-alive HTTP connections, reused across requests to the same host.
+
+    Idle connections are kept per scheme and host; a request takes one (or
+    opens a new one) and gives it back once the body of the response has
+    been read to the end, so sequential requests share a single connection
+    and concurrent ones get one each.
+    """
+
+    def __init__(self, timeout=30, validate_certs=True):
+        self.timeout = timeout
+        self.validate_certs = validate_certs
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def usable(self, url):
+        parts = urlparse(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        if parts.scheme == "https" and not HAS_SSL:
+            return False
+        # fetch_url knows how to go through a proxy, the pool does not
+        proxy = getproxies().get(parts.scheme)
+        return not proxy or bool(proxy_bypass(parts.hostname))
+
+    def _open(self, scheme, netloc):
+        if scheme == "https":
+            context = ssl.create_default_context()
+            if not self.validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            return http_client.HTTPSConnection(
+                netloc, timeout=self.timeout, context=context
+            )
+        return http_client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _checkout(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._open(*key), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle = {}
+
+    def request(self, method, url, body=None, headers=None, count=None):
+        """Send one request and return its response, body still unread.
+
+        The connection goes back to the pool once the body has been read to
+        the end, and is closed if the response is closed before that.
+        ``count`` is called with ``connections_opened`` or ``connections_reused``
+        for every connection the request uses.
+        """
+        count = count or (lambda name, value=1: None)
+        parts = urlparse(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # A file-like body is rewound before it is sent again
+        position = body.tell() if hasattr(body, "tell") else None
+
+        while True:
+            conn, reused = self._checkout(key)
+            count("connections_reused" if reused else "connections_opened")
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+            except (
+                http_client.RemoteDisconnected,
+                BrokenPipeError,
+                ConnectionResetError,
+            ):
+                conn.close()
+                if reused:
+                    # The server closed an idle connection before answering,
+                    # the request never ran, so it is safe to send it again.
+                    if position is not None:
+                        body.seek(position)
+                    continue
+                raise
+            except (http_client.HTTPException, socket.error):
+                # A timeout may come after the server got the request, sending
+                # it again is left to the retry policy of the caller.
+                conn.close()
+                raise
+            return PooledResponse(self, key, conn, resp)
+
+
+class PooledResponse(object):
+    """Response read from a connection of a ``ConnectionPool``.
+
+    The body is read from the socket as the caller asks for it, so a large
+    answer is never held in memory; the connection is given back to the pool
+    as soon as the body has been read to the end.
+    """
+
+    def __init__(self, pool, key, conn, resp):
+        self.pool = pool
+        self.key = key
+        self.conn = conn
+        self.resp = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self._release()
+
+    def getheaders(self):
+        return self.resp.getheaders()
+
+    def _release(self):
+        # The connection can only carry the next request once the body is drained
+        if self.conn is None or not self.resp.isclosed():
+            return
+        conn, self.conn = self.conn, None
+        if self.resp.will_close:
+            conn.close()
+        else:
+            self.pool._checkin(self.key, conn)
+
+    def read(self, size=-1):
+        try:
+            if size is None or size < 0:
+                data = self.resp.read()
+            else:
+                data = self.resp.read(size)
+        except (http_client.HTTPException, socket.error):
+            self.close()
+            raise
+        self._release()
+        return data
+
+    def close(self):
+        if self.conn is not None:
+            # Whatever is left of the body would be read as the next answer
+            conn, self.conn = self.conn, None
+            self.resp.close()
+            conn.close()
+
+
+class BoundedReader(object):
+    """File-like view of the last ``limit`` bytes of a seekable file.
+
+    The bytes are read a chunk at a time by whoever sends the request, so a
+    large file is never held in memory.
+    """
+
+    def __init__(self, fileobj, limit):
+        self.fileobj = fileobj
+        fileobj.seek(0, os.SEEK_END)
+        size = fileobj.tell()
+        self.length = min(size, limit)
+        self.truncated = size > limit
+        self.offset = size - self.length
+        self.seek(0)
+
+    def tell(self):
+        return self.fileobj.tell() - self.offset
+
+    def seek(self, position):
+        self.fileobj.seek(self.offset + position)
+
+    def read(self, size=-1):
+        remaining = self.length - self.tell()
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self.fileobj.read(size)
+
+    def close(self):
+        self.fileobj.close()
+
+
+class RingBuffer(object):
+    """Keep the last ``limit`` bytes written to it, in constant memory."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.chunks = collections.deque()
+        self.size = 0
+        self.written = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+        self.size += len(data)
+        self.written += len(data)
+        # Whole chunks are dropped once the rest is enough to fill the buffer
+        while self.chunks and self.size - len(self.chunks[0]) >= self.limit:
+            self.size -= len(self.chunks.popleft())
+
+    @property
+    def truncated(self):
+        return self.written > self.limit
+
+    def getvalue(self):
+        data = b"".join(self.chunks)
+        return data[len(data) - self.limit :] if self.limit else b""
+
+
+class RateLimiter(object):
+    """Token bucket shared by all the processes of a host through a locked file.
+
+    Every request takes a token. When none is left, the request reserves the
+    next one and sleeps until it is due, so concurrent callers are spaced out
+    at ``rate`` requests per second instead of being throttled by the server.
+    """
+
+    def __init__(self, path, rate, burst=1):
+        self.path = path
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+
+    def acquire(self):
+        """Take one token and return the number of seconds waited for it."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                try:
+                    state = json.loads(f.read())
+                    tokens, updated = state["tokens"], state["updated"]
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated = self.burst, now
+                tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(dict(tokens=tokens, updated=now)))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class DecodedReader(object):
+    """File-like view of a response body, decompressed a chunk at a time.
+
+    ``count`` is called with ``bytes_received`` for the bytes read from the
+    wire and ``bytes_decoded`` for the bytes handed out after decompression.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, fileobj, encoding=None, count=None):
+        self.fileobj = fileobj
+        self.count = count or (lambda name, value=1: None)
+        self.decompressor = None
+        if (encoding or "").strip().lower() in ("gzip", "x-gzip", "deflate"):
+            # Accepts both the gzip and the zlib framing
+            self.decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        self.buffer = b""
+        self.eof = False
+
+    def _decode_chunk(self):
+        chunk = self.fileobj.read(self.CHUNK_SIZE)
+        if chunk:
+            self.count("bytes_received", len(chunk))
+            if self.decompressor is not None:
+                chunk = self.decompressor.decompress(chunk)
+        else:
+            self.eof = True
+            if self.decompressor is not None:
+                chunk = self.decompressor.flush()
+        self.count("bytes_decoded", len(chunk))
+        return chunk
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = [self.buffer]
+            while not self.eof:
+                chunks.append(self._decode_chunk())
+            self.buffer = b""
+            return b"".join(chunks)
+        while len(self.buffer) < size and not self.eof:
+            self.buffer += self._decode_chunk()
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+
+class ResponseCache(object):
+    """On-disk cache of successful GET answers, with a TTL and LRU eviction.
+
+    Entries keep the parsed body, and the ETag and Last-Modified validators
+    used to revalidate them once they are older than the TTL.
+
+    Every entry records the generation of the cache it was fetched in. A
+    change through the API starts a new generation, which makes all the
+    older entries stale, including the ones still being fetched.
+
+    The directory is listed once to learn its size, which is then kept up to
+    date by the writes. It is only listed again when it grows over
+    ``max_size``, and then trimmed to ``LOW_WATER`` of it, so that the next
+    writes do not each list it again.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, directory, ttl, max_size):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self.generation_path = os.path.join(directory, "generation")
+        self._size = None
+        self._size_lock = threading.Lock()
+
+    def _entry_path(self, path):
+        return os.path.join(
+            self.directory, hashlib.sha256(to_bytes(path)).hexdigest() + ".json"
+        )
+
+    def _write(self, path, data):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+        tmp_path = "{0}.{1}.{2}".format(
+            path, os.getpid(), threading.current_thread().ident
+        )
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.rename(tmp_path, path)
+
+    def generation(self):
+        try:
+            with open(self.generation_path, "r") as f:
+                return f.read()
+        except (IOError, OSError):
+            return ""
+
+    def get(self, path):
+        entry_path = self._entry_path(path)
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if entry.get("generation") != self.generation():
+            return None
+        # The modification time orders the entries for the LRU eviction
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return entry
+
+    def fresh(self, entry):
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    def set(self, path, data, generation, etag=None, last_modified=None):
+        entry = dict(
+            path=path,
+            generation=generation,
+            stored_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+            data=data,
+        )
+        entry_path = self._entry_path(path)
+        data = json.dumps(entry)
+        with self._size_lock:
+            if self._size is None:
+                self._size = self._usage()
+            if os.path.exists(entry_path):
+                self._size -= os.path.getsize(entry_path)
+        self._write(entry_path, data)
+        with self._size_lock:
+            self._size += len(to_bytes(data))
+            if self._size > self.max_size:
+                self._evict()
+
+    def refresh(self, entry):
+        entry["stored_at"] = time.time()
+        self._write(self._entry_path(entry["path"]), json.dumps(entry))
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def _usage(self):
+        return sum(size for mtime, size, name in self._entries())
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for mtime, size, name in entries)
+        for mtime, size, name in sorted(entries):
+            if total <= self.max_size * self.LOW_WATER:
+                break
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+        self._size = total
+
+    def invalidate(self):
+        self._write(self.generation_path, str(uuidlib.uuid4()))
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        with self._size_lock:
+            self._size = 0
 
 
 class Response(object):
-    def __init__(self, resp, info):
+    """Answer of the API, its body is parsed on first use and kept.
+
+    With ``stream`` the body is left unread until it is needed, so the items
+    of a listing can be decoded one at a time with ``iter_items``.
+    """
+
+    __slots__ = ("body", "info", "fileobj", "_json")
+
+    _UNPARSED = object()
+
+    def __init__(self, resp, info, data=None, stream=False):
         self.body = None
+        self.fileobj = None
         if resp:
-            self.body = resp.read()
+            if stream:
+                self.fileobj = resp
+            else:
+                self.body = resp.read()
         self.info = info
-
-    @property
-    def json(self):
+        # The parsed body may already be known, for example from the cache
+        self._json = self._UNPARSED if data is None else data
+
+    def iter_items(self, key=None):
+        """Yield the items of the JSON array under ``key``, or of the body."""
+        if self.fileobj is not None and self._json is self._UNPARSED:
+            fileobj, self.fileobj = self.fileobj, None
+            return iter_json_items(fileobj, key)
+        items = self.json
+        if key is not None:
+            items = (items or {}).get(key)
+        return iter(items or [])
+
+    def _parse(self, release_body=False):
+        if self.fileobj is not None:
+            self.body = self.fileobj.read()
+            self.fileobj = None
         if not self.body:
             if "body" in self.info:
                 try:
@@ -34,29 +791,97 @@ class Response(object):
                 except json.decoder.JSONDecodeError:
                     return {}
             return None
+        text = to_text(self.body)
+        if release_body:
+            self.body = None
         try:
-            return json.loads(to_text(self.body))
+            return json.loads(text)
         except ValueError:
             return None
 
+    @property
+    def json(self):
+        if self._json is self._UNPARSED:
+            self._json = self._parse()
+        return self._json
+
+    def release_body(self):
+        """Parse the body, if not done yet, and drop the raw bytes.
+
+        The bytes are dropped before the text is parsed, so a large answer is
+        held as text and parsed at the same time, but never also as bytes.
+        """
+        if self._json is self._UNPARSED:
+            self._json = self._parse(release_body=True)
+        self.body = None
+
     @property
     def status_code(self):
         return self.info["status"]
 
 
 class HealthchecksioHelper:
+    # Filtering on a tag nobody uses returns an empty list, so the probe
+    # costs one small request no matter how many checks the project holds.
+    TOKEN_PROBE_ENDPOINT = "checks/?tag=" + quote("ansible-token-probe", safe="")
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE"])
+    RETRY_STATUSES = frozenset([500, 502, 503, 504])
+
     def __init__(self, module):
         self.module = module
         self.base_url = self._get_base_url(module)
         self.api_token = self._get_api_token(module)
         self.timeout = module.params.get("timeout", 30)
         self.headers = {"X-Api-Key": self.api_token}
-
-        response = self.get("checks")
-        if response.status_code == 401:
-            self.module.fail_json(
-                msg="Failed to login using API token against {0}".format(self.base_url)
+        self.token_validation = self._get_token_validation(module)
+        self.token_validated = False
+        self.stats = dict(requests=0)
+        self._stats_lock = threading.Lock()
+        # Callers running outside of a module process may share their pool
+        self.pool = getattr(module, "connection_pool", None)
+        if self.pool is None and module.params.get("keep_alive"):
+            self.pool = ConnectionPool(
+                timeout=self.timeout,
+                validate_certs=module.params.get("validate_certs", True),
+            )
+        self._check_retry_params(module)
+        self._check_rate_limit_params(module)
+        self.rate_limiter = None
+        if module.params.get("rate_limit") and HAS_FCNTL:
+            self.rate_limiter = RateLimiter(
+                self._rate_limit_path(module),
+                module.params.get("rate_limit"),
+                burst=module.params.get("rate_limit_burst") or 1,
             )
+        self.cache = None
+        if module.params.get("cache_ttl"):
+            self.cache = ResponseCache(
+                self._cache_dir(module),
+                module.params.get("cache_ttl"),
+                module.params.get("cache_max_size") or 0,
+            )
+
+        if self.token_validation == "probe":
+            self.get(self.TOKEN_PROBE_ENDPOINT)
+
+    def _check_retry_params(self, module):
+        # Out of range values would make time.sleep fail in the middle of a run
+        params = module.params
+        for name in ("retries", "retry_delay", "retry_max_delay"):
+            if params.get(name) is not None and params.get(name) < 0:
+                self.fail_json(msg="{0} must be at least 0".format(name))
+        jitter = params.get("retry_jitter")
+        if jitter is not None and not 0 <= jitter <= 1:
+            self.fail_json(msg="retry_jitter must be between 0 and 1")
+
+    def _check_rate_limit_params(self, module):
+        # A negative rate would make the limiter sleep for a negative time
+        params = module.params
+        if params.get("rate_limit") is not None and params.get("rate_limit") < 0:
+            self.fail_json(msg="rate_limit must be at least 0")
+        burst = params.get("rate_limit_burst")
+        if burst is not None and burst < 1:
+            self.fail_json(msg="rate_limit_burst must be at least 1")
 
     def _get_api_token(self, module):
         return module.params.get("management_api_token")
@@ -64,38 +889,315 @@ class HealthchecksioHelper:
     def _get_base_url(self, module):
         return module.params.get("management_api_base_url")
 
+    def _get_token_validation(self, module):
+        return module.params.get("token_validation") or "lazy"
+
+    def _token_key(self):
+        # Identifies the API and token in file names, without the token itself
+        return hashlib.sha256(
+            to_bytes("{0}\n{1}".format(self.base_url, self.api_token))
+        ).hexdigest()[:32]
+
+    def _rate_limit_path(self, module):
+        directory = module.params.get("rate_limit_dir") or tempfile.gettempdir()
+        return os.path.join(directory, "healthchecksio-rate-limit-" + self._token_key())
+
+    def _cache_dir(self, module):
+        directory = module.params.get("cache_dir") or tempfile.gettempdir()
+        return os.path.join(directory, "healthchecksio-cache-" + self._token_key())
+
+    def _cache_lookup(self, path):
+        try:
+            generation = self.cache.generation()
+            return self.cache.get(path), generation
+        except (IOError, OSError, ValueError):
+            return None, None
+
+    def _conditional_headers(self, entry):
+        headers = dict(self.headers)
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _cache_hit(self, url, entry, msg):
+        self.count("cache_hits")
+        return Response(None, dict(url=url, status=200, msg=msg), data=entry["data"])
+
+    def _cache_response(self, method, path, response, generation):
+        try:
+            if method == "GET":
+                data = None
+                if response.status_code == 200:
+                    response.release_body()
+                    data = response.json
+                if data is not None and generation is not None:
+                    self.cache.set(
+                        path,
+                        data,
+                        generation,
+                        etag=response.info.get("etag"),
+                        last_modified=response.info.get("last-modified"),
+                    )
+            elif 200 <= response.status_code < 300:
+                # Any change may show in any list, so everything is fetched again
+                self.cache.invalidate()
+        except (IOError, OSError) as e:
+            self.module.debug(
+                "Healthchecks.io response cache not updated: {0}".format(to_text(e))
+            )
+
+    def _validate_token(self, response):
+        # The first answer from the API tells us whether the token works;
+        # a 401 there is reported as a login failure instead of a request error.
+        if self.token_validation == "none" or self.token_validated:
+            return
+        if response.status_code == 401:
+            self.fail_json(
+                msg="Failed to login using API token against {0}".format(self.base_url)
+            )
+        self.token_validated = True
+
+    def count(self, name, value=1):
+        # Requests may be sent from several threads at once
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    def use_connection_pool(self):
+        # For runs sending many requests to the same host, even without keep_alive
+        if self.pool is None:
+            self.pool = ConnectionPool(
+                timeout=self.timeout,
+                validate_certs=self.module.params.get("validate_certs", True),
+            )
+
+    def _report_stats(self):
+        for name in ("backoff_seconds", "rate_limit_wait_seconds"):
+            if name in self.stats:
+                self.stats[name] = round(self.stats[name], 3)
+        if self.pool is not None:
+            self.module.debug(
+                "Healthchecks.io connections: {0} opened, {1} reused".format(
+                    self.stats.get("connections_opened", 0),
+                    self.stats.get("connections_reused", 0),
+                )
+            )
+        return dict(self.stats)
+
+    def exit_json(self, **kwargs):
+        kwargs["api_stats"] = self._report_stats()
+        self.module.exit_json(**kwargs)
+
+    def fail_json(self, **kwargs):
+        kwargs["api_stats"] = self._report_stats()
+        self.module.fail_json(**kwargs)
+
+    def _fetch(self, url, data=None, headers=None, method="GET"):
+        # Same contract as fetch_url: the response object is only returned for
+        # successful requests, error bodies end up in info["body"].
+        headers = dict(headers or {})
+        headers.setdefault("Accept-Encoding", "gzip, deflate")
+        resp, info = self._fetch_raw(url, data=data, headers=headers, method=method)
+
+        # On errors fetch_url returns both the exhausted HTTPError and the body
+        encoding = info.get("content-encoding")
+        if resp is not None:
+            resp = DecodedReader(resp, encoding, self.count)
+        if isinstance(info.get("body"), bytes) and info["body"]:
+            info["body"] = DecodedReader(
+                io.BytesIO(info["body"]), encoding, self.count
+            ).read()
+        return resp, info
+
+    def _fetch_url(self, url, data=None, headers=None, method="GET"):
+        kwargs = dict(decompress=False) if FETCH_URL_DECOMPRESS else {}
+        return fetch_url(
+            self.module,
+            url,
+            data=data,
+            headers=headers,
+            method=method,
+            timeout=self.timeout,
+            **kwargs,
+        )
+
+    def _fetch_raw(self, url, data=None, headers=None, method="GET"):
+        if self.pool is None or not self.pool.usable(url):
+            return self._fetch_url(url, data=data, headers=headers, method=method)
+
+        request_headers = {
+            "User-Agent": self.module.params.get("http_agent") or "ansible-httpget"
+        }
+        if data is not None:
+            request_headers["Content-Type"] = "application/json"
+        request_headers.update(headers or {})
+
+        info = dict(url=url)
+        position = data.tell() if hasattr(data, "tell") else None
+        try:
+            resp = self.pool.request(
+                method, url, body=data, headers=request_headers, count=self.count
+            )
+            if 300 <= resp.status < 400 and resp.status != 304:
+                # fetch_url follows redirects the way the rest of Ansible does
+                resp.read()
+                if position is not None:
+                    data.seek(position)
+                return self._fetch_url(url, data=data, headers=headers, method=method)
+            info.update((k.lower(), v) for k, v in resp.getheaders())
+            info.update(
+                msg="OK ({0} bytes)".format(info.get("content-length", "unknown")),
+                status=resp.status,
+            )
+            if resp.status >= 400:
+                info.update(
+                    msg="HTTP Error {0}: {1}".format(resp.status, resp.reason),
+                    body=resp.read(),
+                )
+                return None, info
+        except (http_client.HTTPException, socket.error) as e:
+            info.update(msg="Connection failure: {0}".format(to_text(e)), status=-1)
+            return None, info
+        return resp, info
+
     def _url_builder(self, path):
         if path[0] == "/":
             path = path[1:]
         return "%s/%s" % (self.base_url, path)
 
-    def send(self, method, path, data=None):
+    def _retry_after(self, info):
+        # Either a number of seconds or an HTTP date
+        value = info.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            parsed = parsedate(value)
+            if parsed is None:
+                return None
+            return max(0.0, calendar.timegm(parsed) - time.time())
+
+    def _retry_delay(self, attempt, info):
+        """Seconds to wait before sending the request again, None to give up."""
+        params = self.module.params
+        if attempt >= (params.get("retries") or 0):
+            return None
+        max_delay = params.get("retry_max_delay", 60.0)
+        retry_after = self._retry_after(info)
+        if retry_after is not None:
+            # Retrying sooner than the server asks would only be refused again
+            return retry_after if retry_after <= max_delay else None
+        delay = min(params.get("retry_delay", 1.0) * 2**attempt, max_delay)
+        return delay - delay * params.get("retry_jitter", 0.5) * random.random()
+
+    def _wait_for_rate_limit(self):
+        try:
+            waited = self.rate_limiter.acquire()
+        except (IOError, OSError) as e:
+            # Better unthrottled than failing the task over a bucket file
+            self.module.debug(
+                "Healthchecks.io rate limiter disabled: {0}".format(to_text(e))
+            )
+            self.rate_limiter = None
+            return
+        if waited:
+            self.count("rate_limit_wait_seconds", waited)
+
+    def _request(
+        self, method, url, data=None, headers=None, retry_safe=None, stream=False
+    ):
+        """Send a request, retrying throttled and failed ones, and count it.
+
+        Throttled (429) requests were not processed, so they are always sent
+        again. Connection errors and 5xx answers are only retried for
+        idempotent methods, or when ``retry_safe`` says the request can run
+        twice without harm.
+        """
+        if retry_safe is None:
+            retry_safe = method in self.IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self._wait_for_rate_limit()
+            resp, info = self._fetch(url, data=data, headers=headers, method=method)
+            self.count("requests")
+            status = info["status"]
+            retriable = status == 429 or (
+                retry_safe and (status == -1 or status in self.RETRY_STATUSES)
+            )
+            delay = self._retry_delay(attempt, info) if retriable else None
+            if delay is None:
+                return Response(resp, info, stream=stream)
+            self.count("retries")
+            self.count("backoff_seconds", delay)
+            time.sleep(delay)
+            if hasattr(data, "seek"):
+                data.seek(0)
+            attempt += 1
+
+    def send(self, method, path, data=None, retry_safe=None, stream=False):
         url = self._url_builder(path)
+        # Creating with unique updates the matching check instead of
+        # creating a second one, so it is safe to send again.
+        if (
+            retry_safe is None
+            and method == "POST"
+            and isinstance(data, dict)
+            and data.get("unique")
+        ):
+            retry_safe = True
         data = self.module.jsonify(data)
 
         if method == "DELETE":
             if data == "null":
                 data = None
 
-        resp, info = fetch_url(
-            self.module,
+        headers = self.headers
+        entry = generation = None
+        # Caching a streamed listing would hold all of it in memory
+        use_cache = self.cache is not None and not stream
+        if use_cache and method == "GET":
+            entry, generation = self._cache_lookup(path)
+            if entry is not None:
+                if self.cache.fresh(entry):
+                    response = self._cache_hit(url, entry, "OK (cached)")
+                    self._validate_token(response)
+                    return response
+                headers = self._conditional_headers(entry)
+
+        response = self._request(
+            method,
             url,
             data=data,
-            headers=self.headers,
-            method=method,
-            timeout=self.timeout,
+            headers=headers,
+            retry_safe=retry_safe,
+            stream=stream,
         )
-
-        return Response(resp, info)
-
-    def get(self, path, data=None):
-        return self.send("GET", path, data)
+        if entry is not None and response.status_code == 304:
+            # Not modified since it was cached, the body was not sent again
+            self.count("cache_revalidations")
+            try:
+                self.cache.refresh(entry)
+            except (IOError, OSError):
+                pass
+            response = self._cache_hit(url, entry, "OK (not modified)")
+        elif use_cache:
+            if method == "GET":
+                self.count("cache_misses")
+            self._cache_response(method, path, response, generation)
+        self._validate_token(response)
+        return response
+
+    def get(self, path, data=None, stream=False):
+        return self.send("GET", path, data, stream=stream)
 
     def put(self, path, data=None):
         return self.send("PUT", path, data)
 
-    def post(self, path, data=None):
-        return self.send("POST", path, data)
+    def post(self, path, data=None, retry_safe=None):
+        return self.send("POST", path, data, retry_safe=retry_safe)
 
     def delete(self, path, data=None):
         return self.send("DELETE", path, data)
@@ -103,23 +1205,12 @@ class HealthchecksioHelper:
     def head(self, path, data=None, no_headers=False):
         uri = "{0}/{1}".format(self.base_url, path)
         if no_headers is True:
-            resp, info = fetch_url(
-                self.module,
-                uri,
-                data=data,
-                method="HEAD",
-                timeout=self.timeout,
-            )
+            response = self._request("HEAD", uri, data=data)
         else:
-            resp, info = fetch_url(
-                self.module,
-                uri,
-                data=data,
-                headers=self.headers,
-                method="HEAD",
-                timeout=self.timeout,
-            )
-        return Response(resp, info)
+            response = self._request("HEAD", uri, data=data, headers=self.headers)
+
+        self._validate_token(response)
+        return response
 
     @staticmethod
     def healthchecksio_argument_spec():
@@ -184,6 +1275,23 @@ class HealthchecksioHelper:
                 required=False,
                 no_log=True,
             ),
+            token_validation=dict(
+                type="str",
+                choices=["lazy", "probe", "none"],
+                required=False,
+                default="lazy",
+            ),
+            keep_alive=dict(type="bool", required=False, default=False),
+            retries=dict(type="int", required=False, default=0),
+            retry_delay=dict(type="float", required=False, default=1.0),
+            retry_max_delay=dict(type="float", required=False, default=60.0),
+            retry_jitter=dict(type="float", required=False, default=0.5),
+            rate_limit=dict(type="float", required=False, default=0.0),
+            rate_limit_burst=dict(type="int", required=False, default=1),
+            rate_limit_dir=dict(type="path", required=False),
+            cache_ttl=dict(type="int", required=False, default=0),
+            cache_max_size=dict(type="int", required=False, default=10485760),
+            cache_dir=dict(type="path", required=False),
         )
 
 
@@ -197,6 +1305,20 @@ class HealthchecksioPingHelper(HealthchecksioHelper):
     def _get_base_url(self, module):
         return module.params.get("ping_api_base_url")
 
+    def _get_token_validation(self, module):
+        # The ping API does not authenticate with the API token
+        return "none"
+
+    def post_body(self, path, body):
+        """POST the ``BoundedReader`` ``body`` as the ping body."""
+        uri = "{0}/{1}".format(self.base_url, path)
+        headers = {
+            "Content-Type": "text/plain; charset=utf-8",
+            "Content-Length": str(body.length),
+        }
+        # Signals are safe to repeat, a check ends up in the same state
+        return self._request("POST", uri, data=body, headers=headers, retry_safe=True)
+
 
 class BadgesInfo(object):
     def __init__(self, module):
@@ -211,7 +1333,7 @@ class BadgesInfo(object):
         status_code = response.status_code
 
         if status_code != 200:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed to get {0} [HTTP {1}: {2}]".format(
                     endpoint,
@@ -220,7 +1342,7 @@ class BadgesInfo(object):
                 ),
             )
 
-        self.module.exit_json(changed=False, data=json_data)
+        self.rest.exit_json(changed=False, data=json_data)
 
 
 class ChannelsInfo(object):
@@ -232,11 +1354,12 @@ class ChannelsInfo(object):
         endpoint = "channels"
 
         response = self.rest.get(endpoint)
+        response.release_body()
         json_data = response.json
         status_code = response.status_code
 
         if status_code != 200:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed to get {0} [HTTP {1}: {2}]".format(
                     endpoint,
@@ -245,36 +1368,493 @@ class ChannelsInfo(object):
                 ),
             )
 
-        self.module.exit_json(changed=False, data=json_data)
+        self.rest.exit_json(changed=False, data=json_data)
+
+
+class MultiCheckInfo(object):
+    """Gets the pings or flips of several checks, selected by uuid or tag."""
+
+    # Where the records are in the answer, and the CSV columns after uuid
+    LISTING_KEYS = dict(pings="pings", flips=None)
+    CSV_FIELDS = dict(
+        pings=[
+            "n",
+            "type",
+            "date",
+            "scheme",
+            "remote_addr",
+            "method",
+            "ua",
+            "duration",
+            "rid",
+            "exitstatus",
+        ],
+        flips=["timestamp", "up"],
+    )
+
+    def _multi_check(self):
+        params = self.module.params
+        return params.get("uuids") is not None or params.get("tags") is not None
+
+    def _list_checks(self, tags=None):
+        """Return the ``(uuid, status)`` of the checks, from one listing."""
+        endpoint = "checks/"
+        if tags:
+            endpoint += "?" + "&".join("tag=" + quote(tag, safe="") for tag in tags)
+        response = self.rest.get(endpoint, stream=True)
+        if response.status_code != 200:
+            self.rest.fail_json(
+                changed=False,
+                msg="Failed to get {0} [HTTP {1}]".format(
+                    endpoint, response.status_code
+                ),
+            )
+        return [
+            (check.get("uuid"), check.get("status"))
+            for check in response.iter_items("checks")
+        ]
 
+    def _selected_uuids(self, checks=None):
+        uuids = self.module.params.get("uuids")
+        if uuids is None:
+            if checks is None:
+                checks = self._list_checks(self.module.params.get("tags"))
+            uuids = [uuid for uuid, status in checks]
+
+        selected = []
+        seen = set()
+        for uuid in uuids:
+            if uuid and uuid not in seen:
+                seen.add(uuid)
+                selected.append(uuid)
+        return selected
+
+    def _listing_query(self, uuid):
+        return ""
+
+    def _listing_received(self, uuid, data):
+        return data
+
+    def _listings_done(self):
+        pass
+
+    def _keep_item(self, uuid, item):
+        return True
+
+    def _listing_endpoint(self, uuid, listing):
+        endpoint = "checks/{0}/{1}/".format(uuid, listing)
+        query = self._listing_query(uuid)
+        if query:
+            endpoint += "?" + query
+        return endpoint
+
+    def _read_failed(self, endpoint, error, **kwargs):
+        # The connection dropped or the answer could not be understood
+        result = dict(
+            failed=True,
+            status_code=-1,
+            msg="Failed to get {0}: {1}".format(endpoint, to_text(error)),
+        )
+        result.update(kwargs)
+        return result
+
+    def _get_listing(self, uuid, listing):
+        endpoint = self._listing_endpoint(uuid, listing)
+        try:
+            response = self.rest.get(endpoint)
+            response.release_body()
+            if response.status_code != 200:
+                return dict(
+                    failed=True,
+                    status_code=response.status_code,
+                    msg="Failed to get {0} [HTTP {1}]".format(
+                        endpoint, response.status_code
+                    ),
+                )
+            data = self._listing_received(uuid, response.json)
+        except (ValueError, http_client.HTTPException, socket.error) as e:
+            return self._read_failed(endpoint, e)
+        return dict(failed=False, status_code=200, data=data)
+
+    def _get_listings(self, uuids, listing, fetch=None):
+        parallelism = self.module.params.get("parallelism") or 1
+        if parallelism < 1:
+            self.rest.fail_json(msg="parallelism must be at least 1")
+        if fetch is None:
+            fetch = functools.partial(self._get_listing, listing=listing)
+
+        self.rest.use_connection_pool()
+
+        results = []
+        if uuids and not self.rest.token_validated:
+            # A bad token is reported by the first answer, from this thread
+            results.append(fetch(uuids[0]))
+        results.extend(
+            run_concurrently(fetch, uuids[len(results) :], parallelism=parallelism)
+        )
+        return results
+
+    def _export_listing(self, uuid, listing, write):
+        endpoint = self._listing_endpoint(uuid, listing)
+        records = 0
+        try:
+            response = self.rest.get(endpoint, stream=True)
+            if response.status_code != 200:
+                return dict(
+                    failed=True,
+                    status_code=response.status_code,
+                    msg="Failed to get {0} [HTTP {1}]".format(
+                        endpoint, response.status_code
+                    ),
+                )
+            for item in response.iter_items(self.LISTING_KEYS[listing]):
+                if self._keep_item(uuid, item):
+                    write(uuid, item)
+                    records += 1
+        except (ValueError, http_client.HTTPException, socket.error) as e:
+            # The records written before the error stay in the file
+            return self._read_failed(endpoint, e, records=records)
+        return dict(failed=False, status_code=200, records=records)
+
+    def _open_export(self, path, file_format):
+        if PY3:
+            f = io.open(path, "w", encoding="utf-8", newline="")
+        else:
+            f = open(path, "wb")
+        if file_format == "csv":
+            return f, csv.writer(f)
+        return f, None
+
+    def _csv_value(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, sort_keys=True)
+        return value
+
+    def export(self, uuids, listing):
+        """Write the records of the checks to ``dest``, as they are decoded."""
+        params = self.module.params
+        dest = params.get("dest")
+        file_format = params.get("format") or "jsonl"
+        fields = self.CSV_FIELDS[listing]
+
+        tmp_path = os.devnull
+        if not self.module.check_mode:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=".healthchecksio-", dir=os.path.dirname(dest) or "."
+            )
+            os.close(fd)
+        f, writer = self._open_export(tmp_path, file_format)
+        lock = threading.Lock()
+
+        def write(uuid, item):
+            if writer is not None:
+                row = [uuid] + [self._csv_value(item.get(field)) for field in fields]
+                with lock:
+                    writer.writerow(row)
+            else:
+                line = json.dumps(dict(item, uuid=uuid), sort_keys=True) + "\n"
+                with lock:
+                    f.write(to_text(line))
+
+        try:
+            try:
+                if writer is not None:
+                    writer.writerow(["uuid"] + fields)
+                results = self._get_listings(
+                    uuids,
+                    listing,
+                    fetch=functools.partial(
+                        self._export_listing, listing=listing, write=write
+                    ),
+                )
+            finally:
+                f.close()
+
+            failed = [result for result in results if result["failed"]]
+            if failed and not self._multi_check():
+                self.rest.fail_json(changed=False, msg=failed[0]["msg"])
+            if tmp_path != os.devnull:
+                self.module.atomic_move(tmp_path, dest)
+                tmp_path = os.devnull
+        finally:
+            # Left behind when the module failed
+            if tmp_path != os.devnull and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        self._listings_done()
+
+        records = sum(result.get("records", 0) for result in results)
+        msg = "Wrote {0} {1} of {2} checks to {3}".format(
+            records, listing, len(results) - len(failed), dest
+        )
+        if failed:
+            msg += ", failed to get the {0} of {1} checks".format(listing, len(failed))
+        self.rest.exit_json(
+            changed=True,
+            msg=msg,
+            dest=dest,
+            format=file_format,
+            records=records,
+            results=dict(zip(uuids, results)),
+        )
+
+    def _export_or_get_many(self, listing):
+        if self.module.params.get("dest"):
+            if self._multi_check():
+                uuids = self._selected_uuids()
+            else:
+                uuids = [self.module.params.get("uuid")]
+            self.export(uuids, listing)
+        if self._multi_check():
+            self.get_many(listing)
+
+    def get_many(self, listing):
+        uuids = self._selected_uuids()
+        results = self._get_listings(uuids, listing)
+
+        failed = len([result for result in results if result["failed"]])
+        if failed:
+            msg = "Failed to get the {0} of {1} of {2} checks".format(
+                listing, failed, len(results)
+            )
+        else:
+            msg = "Got the {0} of {1} checks".format(listing, len(results))
+        self._listings_done()
+        # A check that failed does not fail the others, see its result
+        self.rest.exit_json(changed=False, msg=msg, results=dict(zip(uuids, results)))
+
+
+class ChecksFlipsInfo(MultiCheckInfo):
+    WINDOW = ("seconds", "start", "end")
 
-class ChecksFlipsInfo(object):
     def __init__(self, module):
         self.module = module
         self.rest = HealthchecksioHelper(module)
+        self.state_file = module.params.get("state_file")
+        self.state = None
+        self._state_lock = threading.Lock()
+        if self.state_file:
+            self.state = self._load_state()
+            self.previous_state = dict(self.state)
+
+    def _load_state(self):
+        # UNIX time of the last flip seen, per check uuid
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f)["checks"]
+        except (IOError, OSError) as e:
+            if e.errno == errno.ENOENT:
+                return {}
+            self.rest.fail_json(
+                msg="Failed to read {0}: {1}".format(self.state_file, to_text(e))
+            )
+        except (ValueError, KeyError, TypeError):
+            self.rest.fail_json(
+                msg="{0} is not a flips state file".format(self.state_file)
+            )
+
+    def _save_state(self):
+        directory = os.path.dirname(self.state_file)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        tmp_path = "{0}.{1}.tmp".format(self.state_file, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(dict(checks=self.state), f, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, self.state_file)
+
+    def _listing_query(self, uuid):
+        params = self.module.params
+        query = dict(
+            (name, params.get(name))
+            for name in self.WINDOW
+            if params.get(name) is not None
+        )
+        if self.state is not None and uuid in self.state:
+            # Only the flips since the last one seen by a previous run
+            query["start"] = max(query.get("start", 0), int(self.state[uuid]))
+        return "&".join(
+            "{0}={1}".format(name, query[name]) for name in self.WINDOW if name in query
+        )
+
+    def _listing_received(self, uuid, data):
+        if self.state is None:
+            return data
+        if isinstance(data, dict) and isinstance(data.get("flips"), list):
+            return dict(data, flips=self._new_flips(uuid, data["flips"]))
+        if isinstance(data, list):
+            return self._new_flips(uuid, data)
+        return data
+
+    def _new_flips(self, uuid, flips):
+        return [flip for flip in flips if self._keep_item(uuid, flip)]
+
+    def _keep_item(self, uuid, item):
+        # Whether a previous run did not return the flip, which is now seen
+        if self.state is None or item.get("timestamp") is None:
+            return True
+        timestamp = parse_timestamp(item["timestamp"])
+        # start is a whole second, the flips seen already are dropped here
+        last = self.previous_state.get(uuid)
+        if last is not None and timestamp <= last:
+            return False
+        with self._state_lock:
+            self.state[uuid] = max(self.state.get(uuid, timestamp), timestamp)
+        return True
+
+    def _listings_done(self):
+        if self.state is not None and not self.module.check_mode:
+            try:
+                self._save_state()
+            except (IOError, OSError) as e:
+                self.rest.fail_json(
+                    msg="Failed to write {0}: {1}".format(self.state_file, to_text(e))
+                )
 
     def get(self):
+        self._export_or_get_many("flips")
+
         uuid = self.module.params.get("uuid", None)
-        endpoint = "checks/{0}/flips".format(uuid)
+        result = self._get_listing(uuid, "flips")
+        if result["failed"]:
+            self.rest.fail_json(changed=False, msg=result["msg"])
 
-        response = self.rest.get(endpoint)
-        json_data = response.json
-        status_code = response.status_code
+        self._listings_done()
+        self.rest.exit_json(changed=False, data=result["data"])
 
-        if status_code != 200:
-            self.module.fail_json(
-                changed=False,
-                msg="Failed to get {0} [HTTP {1}]".format(endpoint, status_code),
-            )
 
-        self.module.exit_json(changed=False, data=json_data)
+class ChecksAvailabilityInfo(MultiCheckInfo):
+    DEFAULT_SECONDS = 30 * 86400
+
+    def __init__(self, module):
+        self.module = module
+        self.rest = HealthchecksioHelper(module)
+        self.start = self.end = None
+
+    def _window(self):
+        params = self.module.params
+        end = params.get("end")
+        if end is None:
+            end = int(time.time())
+        start = params.get("start")
+        if start is None:
+            start = end - (params.get("seconds") or self.DEFAULT_SECONDS)
+        if start >= end:
+            self.rest.fail_json(msg="The window must start before it ends")
+        return start, end
+
+    def _listing_query(self, uuid):
+        return "start={0}&end={1}".format(self.start, self.end)
+
+    def _summarize(self, result, status):
+        data = result["data"]
+        if isinstance(data, dict):
+            data = data.get("flips") or []
+        flips = sorted(
+            (parse_timestamp(flip["timestamp"]), bool(flip.get("up")))
+            for flip in data or []
+            if flip.get("timestamp")
+        )
+        # Flips alternate, so the first one tells the state at the start of
+        # the window, and a check without flips kept its current state.
+        if flips:
+            up = not flips[0][1]
+        else:
+            up = status != "down"
+        summary = summarize_flips(flips, self.start, self.end, up)
+        summary.update(failed=False)
+        return summary
+
+    def get(self):
+        self.start, self.end = self._window()
+        params = self.module.params
+
+        tags = None
+        if params.get("uuid") is None and params.get("uuids") is None:
+            tags = params.get("tags")
+        checks = self._list_checks(tags)
+        statuses = dict(checks)
+        if params.get("uuid") is not None:
+            uuids = [params.get("uuid")]
+        else:
+            uuids = self._selected_uuids(checks)
+
+        results = self._get_listings(uuids, "flips")
+        summaries = {}
+        for uuid, result in zip(uuids, results):
+            if not result["failed"]:
+                try:
+                    result = self._summarize(result, statuses.get(uuid))
+                except ValueError as e:
+                    result = dict(
+                        failed=True,
+                        status_code=result["status_code"],
+                        msg="Failed to read the flips of {0}: {1}".format(
+                            uuid, to_text(e)
+                        ),
+                    )
+            summaries[uuid] = result
+
+        failed = len([result for result in summaries.values() if result["failed"]])
+        if failed:
+            msg = "Failed to get the flips of {0} of {1} checks".format(
+                failed, len(results)
+            )
+        else:
+            msg = "Computed the availability of {0} checks".format(len(results))
+        self.rest.exit_json(
+            changed=False,
+            msg=msg,
+            window=dict(start=self.start, end=self.end, seconds=self.end - self.start),
+            results=summaries,
+        )
 
 
 class ChecksInfo(object):
+    STATUSES = ["new", "started", "up", "grace", "down", "paused"]
+
     def __init__(self, module):
         self.module = module
         self.rest = HealthchecksioHelper(module)
 
+    def _matcher(self):
+        params = self.module.params
+        status = params.get("status")
+        slug = params.get("slug")
+        name_regex = None
+        if params.get("name_regex") is not None:
+            try:
+                name_regex = re.compile(params.get("name_regex"))
+            except re.error as e:
+                self.rest.fail_json(
+                    changed=False,
+                    msg="name_regex is not a valid regular expression: {0}".format(
+                        to_text(e)
+                    ),
+                )
+
+        def match(check):
+            if status and check.get("status") not in status:
+                return False
+            if slug is not None and check.get("slug") != slug:
+                return False
+            if name_regex is not None and not name_regex.search(
+                check.get("name") or ""
+            ):
+                return False
+            return True
+
+        return match
+
+    def _project(self, check):
+        fields = self.module.params.get("fields")
+        if not fields:
+            return check
+        return dict((field, check[field]) for field in fields if field in check)
+
     def get(self):
         endpoint = "checks"
 
@@ -294,49 +1874,140 @@ class ChecksInfo(object):
             separator = "&" if "?" in endpoint else "?"
             endpoint += separator + "name=" + quote(name, safe="")
 
-        response = self.rest.get(endpoint)
-        json_data = response.json
+        # Filtered again below, for servers that do not know the parameter
+        slug = self.module.params.get("slug", None)
+        if slug is not None:
+            separator = "&" if "?" in endpoint else "?"
+            endpoint += separator + "slug=" + quote(slug, safe="")
+
+        match = self._matcher()
+        response = self.rest.get(endpoint, stream=True)
         status_code = response.status_code
 
         if status_code != 200:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed to get {0} [HTTP {1}]".format(endpoint, status_code),
             )
 
-        self.module.exit_json(changed=False, data=json_data)
+        if uuid is not None:
+            response.release_body()
+            json_data = response.json
+            if isinstance(json_data, dict):
+                json_data = self._project(json_data)
+        else:
+            # Decoded, filtered and projected a check at a time, so neither
+            # the document nor the checks left out are ever held whole
+            json_data = dict(
+                checks=[
+                    self._project(check)
+                    for check in response.iter_items("checks")
+                    if match(check)
+                ]
+            )
+
+        self.rest.exit_json(changed=False, data=json_data, peak_rss_kb=peak_rss_kb())
 
 
-class ChecksPingsInfo(object):
+class ChecksPingsInfo(MultiCheckInfo):
     def __init__(self, module):
         self.module = module
         self.rest = HealthchecksioHelper(module)
 
     def get(self):
+        self._export_or_get_many("pings")
+
         uuid = self.module.params.get("uuid", None)
         endpoint = "checks/{0}/pings".format(uuid)
 
-        response = self.rest.get(endpoint)
-        json_data = response.json
+        response = self.rest.get(endpoint, stream=True)
         status_code = response.status_code
 
         if status_code != 200:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed to get {0} [HTTP {1}: {2}]".format(
                     endpoint,
                     status_code,
-                    json_data.get("message", "(empty error message)"),
+                    response.json.get("message", "(empty error message)"),
                 ),
             )
 
-        self.module.exit_json(changed=False, data=json_data)
+        # Decoded a ping at a time, the document is never held whole
+        json_data = dict(pings=list(response.iter_items("pings")))
+
+        self.rest.exit_json(changed=False, data=json_data, peak_rss_kb=peak_rss_kb())
+
+
+class CheckIndex(object):
+    """Lookup table over one snapshot of the checks list.
+
+    Checks are grouped by the values of their ``unique`` fields, and the
+    normalized definition of each check is reduced to a fingerprint so that
+    idempotency is decided with a single comparison.
+    """
+
+    # Not part of the fingerprint: channels and tags are normalized
+    # separately, grace may be None in the API while the module defaults
+    # it to 3600
+    IGNORED_FIELDS = frozenset(
+        [
+            "unique",
+            "api_key",
+            "management_api_key",
+            "management_api_token",
+            "management_api_base_url",
+            "ping_api_key",
+            "ping_api_base_url",
+            "ping_api_token",
+            "channels",
+            "tags",
+            "grace",
+        ]
+    )
+
+    def __init__(self, checks, unique):
+        self.unique = tuple(unique)
+        self.groups = {}
+        for check in checks:
+            self.groups.setdefault(self.key(check), []).append(check)
+        self._fingerprints = {}
+
+    def key(self, record):
+        return tuple(record.get(k) for k in self.unique)
+
+    def find(self, request_params):
+        return self.groups.get(self.key(request_params), [])
+
+    @classmethod
+    def fields(cls, request_params):
+        return tuple(sorted(k for k in request_params if k not in cls.IGNORED_FIELDS))
+
+    @staticmethod
+    def fingerprint(record, fields, channels):
+        values = [record.get(k) for k in fields]
+        values.append(sorted(channels.split(",")))
+        values.append(record.get("tags", ""))
+        return hashlib.sha1(
+            json.dumps(values, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def check_fingerprint(self, check, fields):
+        key = (id(check), fields)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = self.fingerprint(
+                check, fields, check.get("channels", "")
+            )
+        return self._fingerprints[key]
 
 
 class Checks(object):
     def __init__(self, module):
         self.module = module
         self.rest = HealthchecksioHelper(module)
+        self._channel_ids = None
+        self._checks = None
+        self._indexes = {}
 
     def get_uuid(self, json_data):
         ping_url = json_data.get("ping_url", None)
@@ -349,70 +2020,12 @@ class Checks(object):
         else:
             return "(unable to determine uuid)"
 
-    def _find_existing_check(self, request_params):
-        # Build the tags string as the API does
-        tags = self.module.params.get("tags", [])
-        tags_str = " ".join(tags)
+    def _build_request_params(self, params):
+        request_params = dict(params)
 
-        checks = self.rest.get("checks").json["checks"]
-        unique = request_params.get("unique", [])
-        c = [
-            check
-            for check in checks
-            if all(check.get(k) == request_params.get(k) for k in unique)
-        ]
-
-        if len(c) > 1 and len(unique) != 0:
-            self.module.fail_json(
-                changed=False,
-                msg="Expected to find one check matching unique parameters, {0} found".format(
-                    len(c)
-                ),
-            )
-
-        # Resolve "*" channels to actual channel IDs
-        channels_param = request_params.get("channels", "")
-        if channels_param == "*":
-            channels = self.rest.get("channels").json.get("channels", [])
-            channels_ids = [ch["id"] for ch in channels]
-            channels_str = ",".join(channels_ids)
-        else:
-            channels_str = channels_param
-
-        if len(c) == 1:
-            # Check if params match (excluding unique/api_key/channels/grace)
-            skip = set(
-                [
-                    "unique",
-                    "api_key",
-                    "management_api_key",
-                    "management_api_token",
-                    "management_api_base_url",
-                    "ping_api_key",
-                    "ping_api_base_url",
-                    "ping_api_token",
-                    "channels",
-                    "tags",
-                    "grace",  # API may return None, module defaults to 3600
-                ]
-            )
-            params_match = all(
-                c[0].get(k) == request_params.get(k)
-                for k in request_params
-                if k not in skip
-            )
-            channels_match = sorted(c[0].get("channels", "").split(",")) == sorted(
-                channels_str.split(",")
-            )
-            tags_match = c[0].get("tags", "") == tags_str
-            if params_match and channels_match and tags_match:
-                return c[0]
-        return None
-
-    def create(self):
-        endpoint = "checks/"
-
-        request_params = dict(self.module.params)
+        # Connection options are consumed by the helper, not sent to the API
+        for option in HealthchecksioHelper.healthchecksio_argument_spec():
+            request_params.pop(option, None)
 
         # uuid is not used to create or update
         request_params.pop("uuid", None)
@@ -427,73 +2040,81 @@ class Checks(object):
             del request_params["schedule"]
             del request_params["tz"]
 
-        tags = self.module.params.get("tags", [])
+        tags = params.get("tags") or []
         request_params["tags"] = " ".join(tags)
+        return request_params
+
+    def _resolve_channels(self, channels_param):
+        # Resolve "*" channels to actual channel IDs, once per module run
+        if channels_param != "*":
+            return channels_param
+        if self._channel_ids is None:
+            response = self.rest.get("channels")
+            response.release_body()
+            channels = response.json.get("channels", [])
+            self._channel_ids = ",".join([ch["id"] for ch in channels])
+        return self._channel_ids
+
+    def _get_index(self, unique):
+        # One listing per module run, one index per set of unique fields
+        if self._checks is None:
+            response = self.rest.get("checks/")
+            response.release_body()
+            self._checks = response.json["checks"]
+        key = tuple(unique)
+        if key not in self._indexes:
+            self._indexes[key] = CheckIndex(self._checks, unique)
+        return self._indexes[key]
+
+    def _check_matches(self, index, check, request_params):
+        fields = index.fields(request_params)
+        channels_str = self._resolve_channels(request_params.get("channels", ""))
+        expected = index.fingerprint(request_params, fields, channels_str)
+        return index.check_fingerprint(check, fields) == expected
+
+    def _find_existing_check(self, request_params):
+        unique = request_params.get("unique", [])
+        index = self._get_index(unique)
+        c = index.find(request_params)
+
+        if len(c) > 1 and len(unique) != 0:
+            self.rest.fail_json(
+                changed=False,
+                msg="Expected to find one check matching unique parameters, {0} found".format(
+                    len(c)
+                ),
+            )
+
+        if len(c) == 1 and self._check_matches(index, c[0], request_params):
+            return c[0]
+        return None
+
+    def create(self):
+        endpoint = "checks/"
+
+        request_params = self._build_request_params(self.module.params)
 
         # Look up existing check for idempotency
         existing = self._find_existing_check(request_params)
 
         if self.module.check_mode:
             if existing is not None:
-                self.module.exit_json(
+                self.rest.exit_json(
                     changed=False,
                     data=existing,
                     uuid=self.get_uuid(existing),
                 )
             else:
-                self.module.exit_json(
+                self.rest.exit_json(
                     changed=True,
                     data={},
                     uuid="",
                 )
 
         if existing is not None:
-            # Extract "*" channels for comparison
-            channels_param = request_params.get("channels", "")
-            if channels_param == "*":
-                channels = self.rest.get("channels").json.get("channels", [])
-                channels_ids = [ch["id"] for ch in channels]
-                channels_str = ",".join(channels_ids)
-            else:
-                channels_str = channels_param
-
-            before = existing
-            channels_match = sorted(before.get("channels", "").split(",")) == sorted(
-                channels_str.split(",")
-            )
-            skip_idempotency_params = [
-                "unique",
-                "api_key",
-                "management_api_key",
-                "management_api_token",
-                "management_api_base_url",
-                "ping_api_key",
-                "ping_api_base_url",
-                "ping_api_token",
-                "channels",
-                "tags",
-                # grace: API may return None, module defaults to 3600
-                "grace",
-                # desc: API returns "", module params has None (no default in spec)
-                "desc",
-            ]
-            params_match = all(
-                before.get(k) == request_params.get(k)
-                for k in request_params
-                if k not in skip_idempotency_params
-            )
-            tags_match = before.get("tags", "") == request_params.get("tags")
-            if params_match and channels_match and tags_match:
-                diff = (
-                    dict(before=before, after=before)
-                    if getattr(self.module, "diff_mode", False)
-                    else None
-                )
-                self.module.exit_json(
-                    changed=False,
-                    data=before,
-                    uuid=self.get_uuid(before),
-                )
+            self.rest.exit_json(
+                changed=False, data=existing, uuid=self.get_uuid(existing)
+            )
 
         response = self.rest.post(endpoint, data=request_params)
         json_data = response.json
@@ -501,13 +2122,7 @@ class Checks(object):
 
         if status_code == 200:
             uuid = self.get_uuid(json_data)
-            after = json_data
-            diff = (
-                dict(before=existing, after=after)
-                if getattr(self.module, "diff_mode", False)
-                else None
-            )
-            self.module.exit_json(
+            self.rest.exit_json(
                 changed=True,
                 msg="Existing check {0} found and updated".format(uuid),
                 data=json_data,
@@ -516,12 +2131,7 @@ class Checks(object):
 
         elif status_code == 201:
             uuid = self.get_uuid(json_data)
-            diff = (
-                dict(before={}, after=json_data)
-                if getattr(self.module, "diff_mode", False)
-                else None
-            )
-            self.module.exit_json(
+            self.rest.exit_json(
                 changed=True,
                 msg="New check {0} created".format(uuid),
                 data=json_data,
@@ -529,7 +2139,7 @@ class Checks(object):
             )
 
         else:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed to create or update check [HTTP {0}: {1}]".format(
                     status_code, json_data.get("error", "(empty error message)")
@@ -541,7 +2151,7 @@ class Checks(object):
         endpoint = "checks/{0}".format(uuid)
 
         if self.module.check_mode:
-            self.module.exit_json(
+            self.rest.exit_json(
                 changed=True,
                 msg="Check {0} would be deleted".format(uuid),
                 uuid=uuid,
@@ -551,13 +2161,13 @@ class Checks(object):
         status_code = response.status_code
 
         if status_code == 200:
-            self.module.exit_json(
+            self.rest.exit_json(
                 changed=True, msg="Check {0} successfully deleted".format(uuid)
             )
         elif status_code == 404:
-            self.module.exit_json(changed=False, msg="Check {0} not found".format(uuid))
+            self.rest.exit_json(changed=False, msg="Check {0} not found".format(uuid))
         else:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed delete check {0} [HTTP {1}]".format(uuid, status_code),
             )
@@ -567,54 +2177,749 @@ class Checks(object):
         endpoint = "checks/{0}/pause".format(uuid)
 
         if self.module.check_mode:
-            self.module.exit_json(
+            self.rest.exit_json(
                 changed=True,
                 msg="Check {0} would be paused".format(uuid),
                 uuid=uuid,
             )
 
-        response = self.rest.post(endpoint)
+        response = self.rest.post(endpoint, retry_safe=True)
         status_code = response.status_code
 
         if status_code == 200:
-            self.module.exit_json(
+            self.rest.exit_json(
                 changed=True, msg="Check {0} successfully paused".format(uuid)
             )
         elif status_code == 404:
-            self.module.exit_json(changed=False, msg="Check {0} not found".format(uuid))
+            self.rest.exit_json(changed=False, msg="Check {0} not found".format(uuid))
         else:
-            self.module.fail_json(
+            self.rest.fail_json(
                 changed=False,
                 msg="Failed to pause check {0} [HTTP {1}]".format(uuid, status_code),
             )
 
 
+class ChecksBulk(Checks):
+    def _check_uuid(self, check):
+        return check.get("uuid") or self.get_uuid(check)
+
+    def _plan(self, checks):
+        unique = self.module.params.get("unique")
+        index = CheckIndex(checks, unique)
+
+        results = []
+        mutations = []
+        claimed = set()
+        for item in self.module.params.get("checks"):
+            request_params = self._build_request_params(item)
+            request_params["unique"] = unique
+            key = index.key(request_params)
+            result = dict(name=request_params.get("name"), uuid="")
+            results.append(result)
+
+            if key in claimed:
+                result.update(
+                    action="failed",
+                    msg="Another item already uses the same unique parameters",
+                )
+                continue
+            claimed.add(key)
+
+            matches = index.find(request_params)
+            if len(matches) > 1:
+                result.update(
+                    action="failed",
+                    msg="Expected to find one check matching unique parameters, {0} found".format(
+                        len(matches)
+                    ),
+                )
+                continue
+
+            if len(matches) == 1:
+                existing = matches[0]
+                result["uuid"] = self._check_uuid(existing)
+                if self._check_matches(index, existing, request_params):
+                    result.update(action="unchanged", data=existing)
+                    continue
+                body = dict(request_params)
+                body.pop("unique")
+                result["action"] = "updated"
+                mutations.append(
+                    (result, "POST", "checks/{0}".format(result["uuid"]), body)
+                )
+            else:
+                result["action"] = "created"
+                mutations.append((result, "POST", "checks/", request_params))
+
+        if self.module.params.get("purge"):
+            purge_tags = set(self.module.params.get("purge_tags") or [])
+            for key, matches in index.groups.items():
+                if key in claimed:
+                    continue
+                for check in matches:
+                    if not purge_tags.issubset(check.get("tags", "").split()):
+                        continue
+                    result = dict(
+                        name=check.get("name"),
+                        uuid=self._check_uuid(check),
+                        action="deleted",
+                    )
+                    results.append(result)
+                    mutations.append(
+                        (result, "DELETE", "checks/{0}".format(result["uuid"]), None)
+                    )
+
+        return results, mutations
+
+    def _apply(self, mutation):
+        result, method, endpoint, body = mutation
+        # Creates are upserts on unique, updates and deletes are idempotent
+        response = self.rest.send(method, endpoint, body, retry_safe=True)
+        json_data = response.json or {}
+        status_code = response.status_code
+
+        if status_code in (200, 201):
+            if method != "DELETE":
+                result["uuid"] = self.get_uuid(json_data)
+                result["data"] = json_data
+            if status_code == 200 and result["action"] == "created":
+                # The API upserted a check created since the listing was taken
+                result["action"] = "updated"
+        elif method == "DELETE" and status_code == 404:
+            result["action"] = "unchanged"
+            result["msg"] = "Check {0} not found".format(result["uuid"])
+        else:
+            result["action"] = "failed"
+            result["msg"] = "Failed to {0} {1} [HTTP {2}: {3}]".format(
+                method,
+                endpoint,
+                status_code,
+                json_data.get("error", "(empty error message)"),
+            )
+        return result
+
+    def reconcile(self):
+        response = self.rest.get("checks/")
+        json_data = response.json
+        status_code = response.status_code
+
+        if status_code != 200:
+            self.rest.fail_json(
+                changed=False,
+                msg="Failed to get checks [HTTP {0}]".format(status_code),
+            )
+
+        results, mutations = self._plan(json_data.get("checks", []))
+
+        if not self.module.check_mode:
+            applied = run_concurrently(
+                self._apply,
+                mutations,
+                parallelism=self.module.params.get("parallelism"),
+                fail_fast=self.module.params.get("fail_fast"),
+                is_failure=lambda result: result["action"] == "failed",
+            )
+            for mutation, result in zip(mutations, applied):
+                if result is None:
+                    mutation[0].update(
+                        action="skipped", msg="Skipped after an earlier failure"
+                    )
+
+        summary = dict(
+            created=0, updated=0, unchanged=0, deleted=0, failed=0, skipped=0
+        )
+        for result in results:
+            summary[result["action"]] += 1
+
+        changed = any(
+            result["action"] in ("created", "updated", "deleted") for result in results
+        )
+        msg = "{created} created, {updated} updated, {unchanged} unchanged, {deleted} deleted, {failed} failed, {skipped} skipped".format(
+            **summary
+        )
+
+        if summary["failed"] or summary["skipped"]:
+            self.rest.fail_json(
+                changed=changed, msg=msg, results=results, summary=summary
+            )
+        self.rest.exit_json(changed=changed, msg=msg, results=results, summary=summary)
+
+
+class PingSpool(object):
+    """Append-only JSON lines file of the pings waiting to be sent.
+
+    Appending only holds the lock for one write. A flush moves the queued
+    pings aside, sends them without holding the lock, and puts the ones it
+    could not send back in front of the pings queued in the meantime.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.flushing_path = path + ".flushing"
+
+    @contextlib.contextmanager
+    def _locked(self, suffix):
+        with open(self.path + suffix, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self, path):
+        records = []
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A line cut short by a crash while appending
+                        continue
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                raise
+        return records
+
+    def _write(self, path, records, mode):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | mode, 0o600)
+        with os.fdopen(fd, "w") as f:
+            for record in records:
+                f.write(json.dumps(record, sort_keys=True) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, records):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        with self._locked(".lock"):
+            self._write(self.path, records, os.O_APPEND)
+
+    def flushing(self):
+        """Lock held for a whole flush, so flushes never overlap."""
+        return self._locked(".flush.lock")
+
+    def take(self):
+        with self._locked(".lock"):
+            if os.path.exists(self.path):
+                if os.path.exists(self.flushing_path):
+                    # Left over by a flush that did not finish
+                    self._write(self.flushing_path, self._read(self.path), os.O_APPEND)
+                    os.unlink(self.path)
+                else:
+                    os.rename(self.path, self.flushing_path)
+        return self._read(self.flushing_path)
+
+    def give_back(self, records):
+        with self._locked(".lock"):
+            queued = records + self._read(self.path)
+            if queued:
+                tmp_path = "{0}.{1}".format(self.path, os.getpid())
+                self._write(tmp_path, queued, os.O_TRUNC)
+                os.rename(tmp_path, self.path)
+            elif os.path.exists(self.path):
+                os.unlink(self.path)
+            if os.path.exists(self.flushing_path):
+                os.unlink(self.flushing_path)
+
+
 class Ping(object):
+    SIGNALS = ["success", "fail", "start"]
+    MUTUALLY_EXCLUSIVE = [("uuid", "uuids", "pings", "slug"), ("data", "data_file")]
+    REQUIRED_ONE_OF = [("uuid", "uuids", "pings", "slug")]
+    DEFAULT_SPOOL_FILE = "~/.ansible/healthchecksio/ping-spool.jsonl"
+
     def __init__(self, module):
         self.module = module
         self.rest = HealthchecksioPingHelper(module)
 
-    def create(self, uuid, signal):
-        if self.module.check_mode:
-            self.module.exit_json(changed=False, data={})
+    @staticmethod
+    def argument_spec():
+        # Shared by the ping module and the ping action plugin
+        argument_spec = HealthchecksioHelper.healthchecksio_argument_spec()
+        argument_spec.update(
+            state=dict(type="str", choices=["present"], default="present"),
+            uuid=dict(type="str", required=False),
+            slug=dict(type="str", required=False),
+            uuids=dict(type="list", elements="str", required=False),
+            pings=dict(
+                type="list",
+                elements="dict",
+                required=False,
+                options=dict(
+                    uuid=dict(type="str", required=False),
+                    slug=dict(type="str", required=False),
+                    signal=dict(type="str", choices=Ping.SIGNALS, required=False),
+                ),
+                mutually_exclusive=[("uuid", "slug")],
+                required_one_of=[("uuid", "slug")],
+            ),
+            signal=dict(
+                type="str",
+                choices=Ping.SIGNALS,
+                required=False,
+                default="success",
+            ),
+            create=dict(type="bool", required=False, default=False),
+            data=dict(type="str", required=False),
+            data_file=dict(type="path", required=False),
+            max_body_size=dict(type="int", required=False, default=100000),
+            exit_status=dict(type="int", required=False),
+            run_id=dict(type="str", required=False),
+            parallelism=dict(type="int", required=False, default=1),
+            delivery=dict(
+                type="str",
+                choices=["direct", "spool"],
+                required=False,
+                default="direct",
+            ),
+            spool_file=dict(
+                type="path", required=False, default=Ping.DEFAULT_SPOOL_FILE
+            ),
+            ping_from=dict(
+                type="str",
+                choices=["controller", "target"],
+                required=False,
+                default="controller",
+            ),
+        )
+        return argument_spec
+
+    def run(self):
+        params = self.module.params
+        if params.get("parallelism") < 1:
+            self.rest.fail_json(msg="parallelism must be at least 1")
+        if params.get("max_body_size") < 0:
+            self.rest.fail_json(msg="max_body_size must be at least 0")
+        exit_status = params.get("exit_status")
+        if exit_status is not None and not 0 <= exit_status <= 255:
+            self.rest.fail_json(msg="exit_status must be between 0 and 255")
+
+        if params.get("state") == "present":
+            if params.get("uuid") is not None:
+                pings = [dict(uuid=params.get("uuid"))]
+            elif params.get("slug") is not None:
+                pings = [dict(slug=params.get("slug"))]
+            elif params.get("uuids") is not None:
+                pings = [dict(uuid=uuid) for uuid in params.get("uuids")]
+            else:
+                pings = params.get("pings")
 
-        if signal == "success":
-            endpoint = "{0}".format(uuid)
-        else:
-            endpoint = "{0}/{1}".format(uuid, signal)
+            if params.get("delivery") == "spool":
+                self.queue(pings)
+            elif params.get("uuid") is not None or params.get("slug") is not None:
+                self.create(
+                    params.get("uuid"), params.get("signal"), slug=params.get("slug")
+                )
+            else:
+                self.create_many(pings)
+
+    def _ping(self, uuid=None, slug=None, signal=None, **kwargs):
+        """Everything needed to send one signal, defaulting to the module options."""
+        params = self.module.params
+        ping = dict(
+            uuid=uuid,
+            slug=slug,
+            signal=signal or params.get("signal"),
+            exit_status=params.get("exit_status"),
+            run_id=params.get("run_id"),
+            create=params.get("create"),
+            data=params.get("data"),
+            data_file=params.get("data_file"),
+        )
+        ping.update(kwargs)
+        return ping
 
-        response = self.rest.head(endpoint, no_headers=True)
-        status_code = response.status_code
+    def _pings(self, pings):
+        return [
+            self._ping(
+                uuid=ping.get("uuid"), slug=ping.get("slug"), signal=ping.get("signal")
+            )
+            for ping in pings
+        ]
 
-        if status_code == 200:
-            self.module.exit_json(
-                changed=True, msg="Sent {0} signal to {1}".format(signal, endpoint)
+    def _target(self, ping):
+        # Slug URLs live under the project ping key, which is left out of the
+        # target so it never shows up in the messages.
+        target = ping["uuid"] if ping["slug"] is None else ping["slug"]
+        if ping["exit_status"] is not None:
+            return "{0}/{1}".format(target, ping["exit_status"])
+        if ping["signal"] == "success":
+            return "{0}".format(target)
+        return "{0}/{1}".format(target, ping["signal"])
+
+    def _endpoint(self, ping):
+        endpoint = self._target(ping)
+        if ping["slug"] is not None:
+            endpoint = "{0}/{1}".format(
+                self.module.params.get("ping_api_token"), endpoint
             )
+        query = []
+        if ping["slug"] is not None and ping["create"]:
+            query.append("create=1")
+        if ping["run_id"]:
+            query.append("rid=" + quote(ping["run_id"], safe=""))
+        if query:
+            endpoint += "?" + "&".join(query)
+        return endpoint
+
+    def _open_body(self, ping):
+        if ping["data_file"] is not None:
+            fileobj = open(ping["data_file"], "rb")
+        elif ping["data"] is not None:
+            fileobj = io.BytesIO(to_bytes(ping["data"]))
+        else:
+            return None
+        return BoundedReader(fileobj, self.module.params.get("max_body_size"))
 
+    def _send(self, ping):
+        endpoint = self._endpoint(ping)
+        try:
+            body = self._open_body(ping)
+        except (IOError, OSError) as e:
+            return None, "Failed to read {0}: {1}".format(ping["data_file"], to_text(e))
+        if body is None:
+            return self.rest.head(endpoint, no_headers=True).status_code, None
+        try:
+            return self.rest.post_body(endpoint, body).status_code, None
+        finally:
+            body.close()
+
+    def _send_one(self, ping):
+        target = self._target(ping)
+        status_code, error = self._send(ping)
+        result = dict(signal=ping["signal"], status_code=status_code)
+        if ping["slug"] is None:
+            result.update(uuid=ping["uuid"])
+        else:
+            result.update(slug=ping["slug"])
+
+        if ping["exit_status"] is not None:
+            result.update(exit_status=ping["exit_status"])
+            signal = "exit status {0}".format(ping["exit_status"])
         else:
-            self.module.fail_json(
+            signal = "{0} signal".format(ping["signal"])
+
+        # 201 means the check was just created by ?create=1
+        if status_code in (200, 201):
+            result.update(
+                changed=True,
+                failed=False,
+                msg="Sent {0} to {1}".format(signal, target),
+            )
+        elif error is not None:
+            result.update(changed=False, failed=True, msg=error)
+        else:
+            result.update(
                 changed=False,
-                msg="Failed to send {0} signal to {1} [HTTP {2}]".format(
-                    signal, endpoint, status_code
+                failed=True,
+                msg="Failed to send {0} to {1} [HTTP {2}]".format(
+                    signal, target, status_code
                 ),
             )
+        return result
+
+    def _check_ping_key(self, pings):
+        if not self.module.params.get("ping_api_token"):
+            if [ping for ping in pings if ping.get("slug") is not None]:
+                self.rest.fail_json(
+                    msg="ping_api_token is required to ping checks by slug"
+                )
+
+    def _send_many(self, pings, send_group):
+        # The signals of one check are sent in order by a single worker,
+        # so a start cannot overtake the success that follows it.
+        groups = []
+        by_check = {}
+        for i, ping in enumerate(pings):
+            check = (ping["uuid"], ping["slug"])
+            if check not in by_check:
+                by_check[check] = []
+                groups.append(by_check[check])
+            by_check[check].append((i, ping))
+
+        self.rest.use_connection_pool()
+        results = [None] * len(pings)
+        for sent in run_concurrently(
+            send_group, groups, parallelism=self.module.params.get("parallelism")
+        ):
+            for i, result in sent:
+                results[i] = result
+        return results
+
+    def create(self, uuid, signal, slug=None):
+        ping = self._ping(uuid=uuid, slug=slug, signal=signal)
+        self._check_ping_key([ping])
+        if self.module.check_mode:
+            self.rest.exit_json(changed=False, data={})
+
+        result = self._send_one(ping)
+        if result["failed"]:
+            self.rest.fail_json(changed=False, msg=result["msg"])
+        self.rest.exit_json(changed=True, msg=result["msg"])
+
+    def create_many(self, pings):
+        pings = self._pings(pings)
+        self._check_ping_key(pings)
+
+        if self.module.check_mode:
+            results = []
+            for ping in pings:
+                if ping["slug"] is None:
+                    results.append(dict(uuid=ping["uuid"], signal=ping["signal"]))
+                else:
+                    results.append(dict(slug=ping["slug"], signal=ping["signal"]))
+            self.rest.exit_json(changed=False, results=results)
+
+        def send_group(group):
+            return [(i, self._send_one(ping)) for i, ping in group]
+
+        results = self._send_many(pings, send_group)
+        failed = len([result for result in results if result["failed"]])
+        changed = failed < len(results)
+        if failed:
+            self.rest.fail_json(
+                changed=changed,
+                msg="Failed to send {0} of {1} signals".format(failed, len(results)),
+                results=results,
+            )
+        self.rest.exit_json(
+            changed=changed,
+            msg="Sent {0} signals".format(len(results)),
+            results=results,
+        )
+
+    def queue(self, pings):
+        if not HAS_FCNTL:
+            self.rest.fail_json(msg="delivery=spool requires fcntl file locking")
+        pings = self._pings(pings)
+        if self.module.check_mode:
+            self.rest.exit_json(changed=False, queued=0)
+
+        records = []
+        queued_at = time.time()
+        for ping in pings:
+            # The body is read now, the file may be gone when the spool is flushed
+            try:
+                body = self._open_body(ping)
+            except (IOError, OSError) as e:
+                self.rest.fail_json(
+                    msg="Failed to read {0}: {1}".format(ping["data_file"], to_text(e))
+                )
+            if body is not None:
+                try:
+                    ping["data"] = to_text(body.read(), errors="surrogate_or_replace")
+                finally:
+                    body.close()
+            ping.update(data_file=None, queued_at=queued_at)
+            records.append(ping)
+
+        spool_file = self.module.params.get("spool_file")
+        try:
+            PingSpool(spool_file).append(records)
+        except (IOError, OSError) as e:
+            self.rest.fail_json(
+                msg="Failed to queue the signals in {0}: {1}".format(
+                    spool_file, to_text(e)
+                )
+            )
+        self.rest.exit_json(
+            changed=True,
+            msg="Queued {0} signals in {1}".format(len(records), spool_file),
+            queued=len(records),
+        )
+
+
+class PingFlush(Ping):
+    """Send the pings queued by the ping module with delivery=spool."""
+
+    @staticmethod
+    def argument_spec():
+        argument_spec = HealthchecksioHelper.healthchecksio_argument_spec()
+        argument_spec.update(
+            state=dict(type="str", choices=["present"], default="present"),
+            spool_file=dict(
+                type="path", required=False, default=Ping.DEFAULT_SPOOL_FILE
+            ),
+            parallelism=dict(type="int", required=False, default=1),
+            max_body_size=dict(type="int", required=False, default=100000),
+        )
+        return argument_spec
+
+    def _send_group(self, group):
+        # Once a signal fails, the later ones of the same check wait with it
+        sent = []
+        for i, ping in group:
+            if sent and sent[-1][1]["failed"]:
+                sent.append((i, None))
+            else:
+                sent.append((i, self._send_one(ping)))
+        return sent
+
+    def _dedupe(self, records):
+        # A signal spooled twice for the same run is sent once
+        seen = set()
+        unique = []
+        for record in records:
+            if record.get("run_id"):
+                key = tuple(
+                    record.get(name)
+                    for name in ("uuid", "slug", "signal", "exit_status", "run_id")
+                )
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(record)
+        return unique
+
+    def run(self):
+        params = self.module.params
+        if not HAS_FCNTL:
+            self.rest.fail_json(msg="Flushing the spool requires fcntl file locking")
+        if params.get("parallelism") < 1:
+            self.rest.fail_json(msg="parallelism must be at least 1")
+
+        spool = PingSpool(params.get("spool_file"))
+        if not os.path.exists(params.get("spool_file")) and not os.path.exists(
+            spool.flushing_path
+        ):
+            self.rest.exit_json(
+                changed=False, msg="No queued signals", sent=0, pending=0
+            )
+        if self.module.check_mode:
+            self.rest.exit_json(changed=False, sent=0)
+
+        try:
+            with spool.flushing():
+                records = spool.take()
+                pings = self._dedupe(records)
+                self._check_ping_key(pings)
+                pings = [self._ping(**record) for record in pings]
+                results = self._send_many(pings, self._send_group)
+                pending = [
+                    record
+                    for record, result in zip(pings, results)
+                    if result is None or result["failed"]
+                ]
+                spool.give_back(pending)
+        except (IOError, OSError) as e:
+            self.rest.fail_json(
+                msg="Failed to flush {0}: {1}".format(
+                    params.get("spool_file"), to_text(e)
+                )
+            )
+
+        sent = len(pings) - len(pending)
+        self.rest.exit_json(
+            changed=sent > 0,
+            msg="Sent {0} signals, {1} still queued".format(sent, len(pending)),
+            sent=sent,
+            pending=len(pending),
+            duplicates=len(records) - len(pings),
+            results=[result for result in results if result is not None],
+        )
+
+
+class Run(Ping):
+    """Run a command between a start signal and an exit status signal."""
+
+    CHUNK_SIZE = 65536
+
+    @staticmethod
+    def argument_spec():
+        argument_spec = HealthchecksioHelper.healthchecksio_argument_spec()
+        argument_spec.update(
+            state=dict(type="str", choices=["present"], default="present"),
+            uuid=dict(type="str", required=False),
+            slug=dict(type="str", required=False),
+            create=dict(type="bool", required=False, default=False),
+            cmd=dict(type="str", required=False),
+            argv=dict(type="list", elements="str", required=False),
+            chdir=dict(type="path", required=False),
+            run_id=dict(type="str", required=False),
+            max_body_size=dict(type="int", required=False, default=100000),
+        )
+        return argument_spec
+
+    def _execute(self, argv):
+        output = RingBuffer(self.module.params.get("max_body_size"))
+        with open(os.devnull, "rb") as devnull:
+            process = subprocess.Popen(
+                argv,
+                cwd=self.module.params.get("chdir"),
+                stdin=devnull,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        fd = process.stdout.fileno()
+        while True:
+            chunk = os.read(fd, self.CHUNK_SIZE)
+            if not chunk:
+                break
+            output.write(chunk)
+        process.stdout.close()
+        return process.wait(), output
+
+    def run(self):
+        params = self.module.params
+        if params.get("max_body_size") < 0:
+            self.rest.fail_json(msg="max_body_size must be at least 0")
+        uuid, slug = params.get("uuid"), params.get("slug")
+        self._check_ping_key([dict(slug=slug)])
+        if params.get("cmd") is not None:
+            try:
+                argv = shlex.split(params.get("cmd"))
+            except ValueError as e:
+                self.rest.fail_json(msg="Failed to parse cmd: {0}".format(to_text(e)))
+        else:
+            argv = params.get("argv")
+        if not argv:
+            # Checked before the start signal, nothing would run
+            self.rest.fail_json(msg="cmd or argv must name the command to run")
+        if not params.get("run_id"):
+            params["run_id"] = str(uuidlib.uuid4())
+
+        # Both signals go over the same connection when the server keeps it
+        self.rest.use_connection_pool()
+        pings = [self._send_one(self._ping(uuid=uuid, slug=slug, signal="start"))]
+
+        started = time.time()
+        try:
+            rc, output = self._execute(argv)
+        except (IOError, OSError) as e:
+            rc, output = None, RingBuffer(params.get("max_body_size"))
+            output.write(to_bytes("Failed to run {0}: {1}".format(argv[0], e)))
+        duration = time.time() - started
+
+        tail = to_text(output.getvalue(), errors="surrogate_or_replace")
+        if rc is None:
+            ping = self._ping(uuid=uuid, slug=slug, signal="fail", data=tail)
+        else:
+            # Killed by a signal, reported the way a shell would
+            ping = self._ping(
+                uuid=uuid,
+                slug=slug,
+                signal="success",
+                data=tail,
+                exit_status=rc if rc >= 0 else 128 - rc,
+            )
+        pings.append(self._send_one(ping))
+
+        result = dict(
+            changed=True,
+            rc=rc,
+            run_id=params.get("run_id"),
+            duration=round(duration, 3),
+            output=tail,
+            output_truncated=output.truncated,
+            pings=pings,
+        )
+        errors = [ping["msg"] for ping in pings if ping["failed"]]
+        if rc is None:
+            self.rest.fail_json(msg=tail, **result)
+        if rc != 0:
+            errors.insert(0, "Command exited with status {0}".format(rc))
+        if errors:
+            self.rest.fail_json(msg=", ".join(errors), **result)
+        self.rest.exit_json(msg="Command exited with status 0", **result)
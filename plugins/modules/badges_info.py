@@ -55,6 +55,17 @@ data:
         shields3: https://healthchecks.io/badge/5dc9afdd-f4da-4b74-bb83-84430f/e823bLfZ/test.shields
         svg: https://healthchecks.io/badge/5dc9afdd-f4da-4b74-bb83-84430f/e823bLfZ-2/test.svg
         svg3: https://healthchecks.io/badge/5dc9afdd-f4da-4b74-bb83-84430f/e823bLfZ/test.svg
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  version_added: 1.6.0
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 1
 """
 
 
@@ -47,6 +47,17 @@ data:
     - id: 853de669-6910-4bc1-a4cc-55f774a135fd
       kind: slack
       name: ''
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  version_added: 1.6.0
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 1
 """
 
 
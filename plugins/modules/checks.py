@@ -176,6 +176,17 @@ uuid:
   returned: changed
   type: str
   sample: 524d0f69-0ff3-4120-a2e2-03ebd5736b25
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  version_added: 1.6.0
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 1
 """
 
 from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
@@ -0,0 +1,207 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: checks_availability_info
+short_description: Get the availability of checks over a time window
+description:
+  - Computes the uptime, the down intervals, the number of flips and the mean time to recovery of checks
+    over a time window, from their flips.
+  - The checks are listed once, and the flips of the window are fetched C(parallelism) checks at a time.
+  - A check that is down at the start of the window is counted as down from the start of the window,
+    a check still down at the end is counted as down until the end of the window.
+  - A check without flips in the window keeps its current state for the whole window, only the
+    C(down) state counts as downtime.
+author: "Mark Mercado (@mamercad)"
+version_added: 1.6.0
+options:
+  state:
+    description:
+      - C(present) will return the availability of the check(s).
+    type: str
+    choices: ["present"]
+    default: present
+  uuid:
+    description:
+      - Returns the availability of this check.
+      - Only one of C(uuid), C(uuids) and C(tags) can be given, all the checks are used when none is.
+    type: str
+    required: false
+  uuids:
+    description:
+      - Returns the availability of each of these checks.
+    type: list
+    elements: str
+    required: false
+  tags:
+    description:
+      - Returns the availability of each check tagged with all these values.
+    type: list
+    elements: str
+    required: false
+  seconds:
+    description:
+      - Length of the window, in seconds, ending at C(end), when C(start) is not given.
+    type: int
+    default: 2592000
+  start:
+    description:
+      - Start of the window, as a UNIX timestamp.
+    type: int
+    required: false
+  end:
+    description:
+      - End of the window, as a UNIX timestamp, now by default.
+    type: int
+    required: false
+  parallelism:
+    description:
+      - Maximum number of checks whose flips are fetched at the same time.
+    type: int
+    default: 1
+extends_documentation_fragment:
+  - community.healthchecksio.healthchecksio.documentation
+"""
+
+EXAMPLES = r"""
+- name: Get the availability of the production checks over the last 90 days
+  community.healthchecksio.checks_availability_info:
+    tags:
+      - prod
+    seconds: "{{ 90 * 86400 }}"
+    parallelism: 8
+  register: availability
+
+- name: Show the checks below 99.9% uptime
+  ansible.builtin.debug:
+    msg: "{{ item.key }}: {{ item.value.uptime_percent }}%"
+  loop: "{{ availability.results | dict2items | selectattr('value.uptime_percent', 'defined') | list }}"
+  when: item.value.uptime_percent < 99.9
+"""
+
+RETURN = r"""
+msg:
+  description: Result message.
+  returned: always
+  type: str
+  sample: Computed the availability of 12 checks
+window:
+  description: Time window used, as UNIX timestamps.
+  returned: always
+  type: dict
+  sample:
+    start: 1631404800
+    end: 1633996800
+    seconds: 2592000
+results:
+  description:
+    - Availability of each selected check, keyed by uuid.
+    - A check whose flips could not be fetched does not fail the module, its result says why.
+  returned: always
+  type: dict
+  contains:
+    failed:
+      description: Whether the flips of the check could not be fetched.
+      returned: always
+      type: bool
+    status_code:
+      description: HTTP status code of the answer.
+      returned: when failed
+      type: int
+    msg:
+      description: Why the flips could not be fetched.
+      returned: when failed
+      type: str
+    uptime_percent:
+      description: Percentage of the window the check was not down.
+      returned: when not failed
+      type: float
+      sample: 99.95
+    downtime_seconds:
+      description: Time the check was down, in seconds.
+      returned: when not failed
+      type: float
+      sample: 1296
+    flips:
+      description: Number of flips in the window.
+      returned: when not failed
+      type: int
+      sample: 4
+    outages:
+      description: Number of down intervals.
+      returned: when not failed
+      type: int
+      sample: 2
+    mttr_seconds:
+      description: Mean duration of the down intervals that ended in the window, C(null) when none did.
+      returned: when not failed
+      type: float
+      sample: 648
+    down_intervals:
+      description: Start and end of each down interval, as UNIX timestamps.
+      returned: when not failed
+      type: list
+      elements: list
+      sample:
+        - [1632000000, 1632000600]
+        - [1633000000, 1633000696]
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 13
+"""
+
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    HealthchecksioHelper,
+    ChecksAvailabilityInfo,
+)
+from ansible.module_utils.basic import AnsibleModule
+
+
+def run(module):
+    state = module.params.pop("state")
+    availability = ChecksAvailabilityInfo(module)
+    if state == "present":
+        availability.get()
+
+
+def main():
+    argument_spec = HealthchecksioHelper.healthchecksio_argument_spec()
+    argument_spec.update(
+        state=dict(type="str", choices=["present"], default="present"),
+        uuid=dict(type="str", required=False),
+        uuids=dict(type="list", elements="str", required=False),
+        tags=dict(type="list", elements="str", required=False),
+        seconds=dict(
+            type="int", required=False, default=ChecksAvailabilityInfo.DEFAULT_SECONDS
+        ),
+        start=dict(type="int", required=False),
+        end=dict(type="int", required=False),
+        parallelism=dict(type="int", required=False, default=1),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("uuid", "uuids", "tags")],
+    )
+
+    run(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: checks_bulk
+short_description: Create, update, and delete many checks in one task
+description:
+  - Converges a whole list of checks in one task.
+  - The checks and integrations are listed once, existing checks are matched to the
+    requested ones by the C(unique) fields, and only the checks that need to change are
+    created, updated, or deleted.
+  - The per-check options behave like the ones of M(community.healthchecksio.checks).
+author: "Mark Mercado (@mamercad)"
+version_added: 1.6.0
+options:
+  state:
+    description:
+      - C(present) will converge the checks.
+    type: str
+    choices: ["present"]
+    default: present
+  checks:
+    description:
+      - The checks that should exist.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - Name of the check.
+        type: str
+        default: ""
+      tags:
+        description:
+          - Tags for the check.
+        type: list
+        elements: str
+        default: []
+      desc:
+        description:
+          - Description of the check.
+        type: str
+        default: ""
+      timeout:
+        description:
+          - A number of seconds, the expected period of this check.
+        type: int
+      grace:
+        description:
+          - A number of seconds, the grace period for this check.
+        type: int
+        default: 3600
+      schedule:
+        description:
+          - A cron expression defining this check's schedule.
+        type: str
+      tz:
+        description:
+          - Server's timezone, used together with C(schedule).
+        type: str
+      manual_resume:
+        description:
+          - Controls whether a paused check automatically resumes when pinged.
+        type: bool
+        default: false
+      methods:
+        description:
+          - Allowed HTTP methods for ping requests, C("") or C(POST).
+        type: str
+        default: ""
+      channels:
+        description:
+          - Comma-separated list of integration UUIDs, or C(*) for all integrations.
+        type: str
+        default: ""
+      slug:
+        description:
+          - Optional slug for the check URL.
+        type: str
+        default: ""
+  unique:
+    description:
+      - Fields used to match a requested check to an existing one.
+      - The accepted values are C(name), C(tags), C(timeout), and C(grace).
+    type: list
+    elements: str
+    default: ["name"]
+  purge:
+    description:
+      - Delete the existing checks that do not match any of the requested checks.
+    type: bool
+    default: false
+  purge_tags:
+    description:
+      - Only purge checks that have all of these tags.
+    type: list
+    elements: str
+    default: []
+  parallelism:
+    description:
+      - Maximum number of create, update, and delete requests sent at the same time.
+    type: int
+    default: 1
+  fail_fast:
+    description:
+      - Stop sending requests after the first failed one.
+      - The requests that were not sent are reported with the C(skipped) action.
+      - By default a failure does not stop the other requests.
+    type: bool
+    default: false
+extends_documentation_fragment:
+  - community.healthchecksio.healthchecksio.documentation
+"""
+
+EXAMPLES = r"""
+- name: Converge the backup checks
+  community.healthchecksio.checks_bulk:
+    unique: ["name"]
+    checks:
+      - name: "backup db01"
+        tags: ["backup"]
+        schedule: "0 2 * * *"
+        tz: UTC
+      - name: "backup db02"
+        tags: ["backup"]
+        schedule: "0 3 * * *"
+        tz: UTC
+
+- name: Converge the backup checks and delete the other backup checks
+  community.healthchecksio.checks_bulk:
+    purge: true
+    purge_tags: ["backup"]
+    checks:
+      - name: "backup db01"
+        tags: ["backup"]
+        timeout: 86400
+"""
+
+RETURN = r"""
+msg:
+  description: Summary of the changes
+  returned: always
+  type: str
+  sample: 1 created, 0 updated, 1 unchanged, 0 deleted, 0 failed, 0 skipped
+summary:
+  description: Number of checks per action
+  returned: always
+  type: dict
+  sample:
+    created: 1
+    updated: 0
+    unchanged: 1
+    deleted: 0
+    failed: 0
+    skipped: 0
+results:
+  description:
+    - One result per requested check, in the order of C(checks), followed by the purged checks.
+    - C(action) is one of C(created), C(updated), C(unchanged), C(deleted), C(failed), or C(skipped).
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - name: backup db01
+      uuid: 524d0f69-0ff3-4120-a2e2-03ebd5736b25
+      action: created
+      data:
+        name: backup db01
+        ping_url: https://hc-ping.com/524d0f69-0ff3-4120-a2e2-03ebd5736b25
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 2
+"""
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    HealthchecksioHelper,
+    ChecksBulk,
+)
+from ansible.module_utils.basic import AnsibleModule
+
+
+def run(module):
+    state = module.params.pop("state")
+    checks = ChecksBulk(module)
+    if state == "present":
+        checks.reconcile()
+
+
+def main():
+    argument_spec = HealthchecksioHelper.healthchecksio_argument_spec()
+    argument_spec.update(
+        state=dict(type="str", choices=["present"], default="present"),
+        checks=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=dict(
+                name=dict(type="str", default=""),
+                tags=dict(type="list", elements="str", default=[]),
+                desc=dict(type="str", default=""),
+                timeout=dict(type="int"),
+                grace=dict(type="int", default=3600),
+                schedule=dict(type="str"),
+                tz=dict(type="str"),
+                manual_resume=dict(type="bool", default=False),
+                methods=dict(type="str", default=""),
+                channels=dict(type="str", default=""),
+                slug=dict(type="str", default=""),
+            ),
+            required_together=[("schedule", "tz")],
+            mutually_exclusive=[("timeout", "schedule"), ("timeout", "tz")],
+        ),
+        unique=dict(type="list", elements="str", default=["name"]),
+        purge=dict(type="bool", default=False),
+        purge_tags=dict(type="list", elements="str", default=[]),
+        parallelism=dict(type="int", default=1),
+        fail_fast=dict(type="bool", default=False),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    if not module.params.get("unique"):
+        module.fail_json(msg="unique must list at least one field")
+    if module.params.get("parallelism") < 1:
+        module.fail_json(msg="parallelism must be at least 1")
+
+    run(module)
+
+
+if __name__ == "__main__":
+    main()
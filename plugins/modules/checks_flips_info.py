@@ -30,6 +30,73 @@ options:
       - If specified, returns this specific check.
     type: str
     required: false
+  uuids:
+    description:
+      - Returns the flips of each of these checks in C(results), instead of the flips of a single check in C(data).
+      - Only one of C(uuid), C(uuids) and C(tags) can be given.
+    type: list
+    elements: str
+    required: false
+    version_added: 1.6.0
+  tags:
+    description:
+      - Returns the flips of each check tagged with all these values in C(results), the checks are listed with a single request.
+      - An empty list selects all the checks.
+    type: list
+    elements: str
+    required: false
+    version_added: 1.6.0
+  parallelism:
+    description:
+      - Maximum number of checks whose flips are fetched at the same time, with C(uuids) or C(tags).
+    type: int
+    default: 1
+    version_added: 1.6.0
+  seconds:
+    description:
+      - Returns only the flips of the last C(seconds) seconds.
+    type: int
+    required: false
+    version_added: 1.6.0
+  start:
+    description:
+      - Returns only the flips newer than this UNIX timestamp.
+    type: int
+    required: false
+    version_added: 1.6.0
+  end:
+    description:
+      - Returns only the flips older than this UNIX timestamp.
+    type: int
+    required: false
+    version_added: 1.6.0
+  state_file:
+    description:
+      - Path of a file where the time of the last flip returned for each check is kept.
+      - When set, only the flips newer than the ones returned by the previous runs are fetched and returned,
+        so a job running every night only downloads the flips of the last day.
+      - The file is not updated in check mode.
+    type: path
+    required: false
+    version_added: 1.6.0
+  dest:
+    description:
+      - Path of a file, on the host the module runs on, to write the flips to instead of returning them.
+      - The flips are written as they are read from the API, so the memory used does not grow with their number,
+        and the module only returns the number of records written.
+      - The file is replaced once all the checks are fetched.
+    type: path
+    required: false
+    version_added: 1.6.0
+  format:
+    description:
+      - Format of C(dest).
+      - C(jsonl) writes one JSON object per line, with the C(uuid) of the check added.
+      - C(csv) writes a header and the columns C(uuid), C(timestamp) and C(up).
+    type: str
+    choices: ["jsonl", "csv"]
+    default: jsonl
+    version_added: 1.6.0
 extends_documentation_fragment:
   - community.healthchecksio.healthchecksio.documentation
 """
@@ -39,15 +106,95 @@ EXAMPLES = r"""
   community.healthchecksio.checks_flips_info:
     state: present
     uuid: cae50618-c97f-483e-9814-0277dc523d1
+
+- name: Get the flips of the production checks, 8 checks at a time
+  community.healthchecksio.checks_flips_info:
+    tags:
+      - prod
+    parallelism: 8
+  register: flips
+
+- name: Get the flips since the last run of the job
+  community.healthchecksio.checks_flips_info:
+    tags:
+      - prod
+    state_file: /var/lib/sla-report/flips-state.json
+
+- name: Write the flips of all the checks to a CSV file on the host
+  community.healthchecksio.checks_flips_info:
+    tags: []
+    parallelism: 8
+    dest: /var/tmp/flips.csv
+    format: csv
 """
 
 RETURN = r"""
 data:
   description: List of check flips
-  returned: always
+  returned: when none of I(uuids), I(tags) and I(dest) is given
   type: dict
   sample:
     flips: []
+msg:
+  description: Result message, with C(uuids) or C(tags).
+  returned: when I(uuids), I(tags) or I(dest) is given
+  type: str
+  sample: Got the flips of 12 checks
+dest:
+  description: Path of the file the flips were written to.
+  returned: when I(dest) is given
+  type: str
+  sample: /var/tmp/flips.jsonl
+format:
+  description: Format of the file the flips were written to.
+  returned: when I(dest) is given
+  type: str
+  sample: jsonl
+records:
+  description: Number of flips written to I(dest).
+  returned: when I(dest) is given
+  type: int
+  sample: 1200
+results:
+  description:
+    - Result of each selected check, keyed by uuid, with C(uuids) or C(tags), or with C(dest).
+    - A check whose flips could not be fetched does not fail the module, its result says why.
+  returned: when I(uuids) or I(tags) is given
+  type: dict
+  contains:
+    failed:
+      description: Whether the flips of the check could not be fetched.
+      returned: always
+      type: bool
+    status_code:
+      description: HTTP status code of the answer.
+      returned: always
+      type: int
+      sample: 200
+    msg:
+      description: Why the flips could not be fetched.
+      returned: when failed
+      type: str
+    data:
+      description: The flips of the check, like C(data) for a single check.
+      returned: when not failed, without I(dest)
+      type: raw
+    records:
+      description: Number of flips of the check written to I(dest).
+      returned: when not failed, with I(dest)
+      type: int
+  version_added: 1.6.0
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  version_added: 1.6.0
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 1
 """
 
 
@@ -70,8 +217,23 @@ def main():
     argument_spec.update(
         state=dict(type="str", choices=["present"], default="present"),
         uuid=dict(type="str", required=False),
+        uuids=dict(type="list", elements="str", required=False),
+        tags=dict(type="list", elements="str", required=False),
+        parallelism=dict(type="int", required=False, default=1),
+        dest=dict(type="path", required=False),
+        format=dict(
+            type="str", choices=["jsonl", "csv"], required=False, default="jsonl"
+        ),
+        seconds=dict(type="int", required=False),
+        start=dict(type="int", required=False),
+        end=dict(type="int", required=False),
+        state_file=dict(type="path", required=False),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("uuid", "uuids", "tags")],
     )
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
     run(module)
 
@@ -40,14 +40,77 @@ options:
     type: str
     required: false
     version_added: 1.5.0
+  slug:
+    description:
+      - If specified, returns only the check with this slug.
+    type: str
+    required: false
+    version_added: 1.6.0
+  status:
+    description:
+      - If specified, returns only the checks in one of these states.
+    type: list
+    elements: str
+    choices: ["new", "started", "up", "grace", "down", "paused"]
+    required: false
+    version_added: 1.6.0
+  name_regex:
+    description:
+      - If specified, returns only the checks whose name matches this Python regular expression,
+        anywhere in the name unless it is anchored.
+    type: str
+    required: false
+    version_added: 1.6.0
+  fields:
+    description:
+      - If specified, returns only these fields of each check, for example C(name), C(uuid) or C(status).
+      - Keeps the module result small, which matters when it runs for many hosts.
+    type: list
+    elements: str
+    required: false
+    version_added: 1.6.0
+notes:
+  - The C(status), C(slug) and C(name_regex) filters and the C(fields) projection are applied while
+    the list of checks is read, the checks left out are never held in memory.
 extends_documentation_fragment:
   - community.healthchecksio.healthchecksio.documentation
 """
 
 EXAMPLES = r"""
+- name: Get the name and uuid of the checks that are down
+  community.healthchecksio.checks_info:
+    status:
+      - down
+    fields:
+      - name
+      - uuid
+      - status
+
+- name: Get the backup checks
+  community.healthchecksio.checks_info:
+    name_regex: "^backup-"
 """
 
 RETURN = r"""
+peak_rss_kb:
+  description:
+    - Peak memory used by the module, in kB, the listing is decoded one item at a time.
+    - C(null) on platforms that do not report it.
+  returned: always
+  type: int
+  sample: 38548
+  version_added: 1.6.0
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  version_added: 1.6.0
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 1
 """
 
 
@@ -72,11 +135,23 @@ def main():
         tags=dict(type="list", elements="str", required=False),
         uuid=dict(type="str", required=False),
         name=dict(type="str", required=False),
+        slug=dict(type="str", required=False),
+        status=dict(
+            type="list", elements="str", choices=ChecksInfo.STATUSES, required=False
+        ),
+        name_regex=dict(type="str", required=False),
+        fields=dict(type="list", elements="str", required=False),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
         supports_check_mode=True,
-        mutually_exclusive=[("tags", "uuid"), ("name", "uuid")],
+        mutually_exclusive=[
+            ("tags", "uuid"),
+            ("name", "uuid"),
+            ("slug", "uuid"),
+            ("status", "uuid"),
+            ("name_regex", "uuid"),
+        ],
     )
 
     run(module)
@@ -26,14 +26,130 @@ options:
   uuid:
     description:
       - Check uuid to delete when state is C(absent) or C(pause).
+      - Exactly one of C(uuid), C(slug), C(uuids), and C(pings) is required.
     type: str
-    required: true
+  slug:
+    description:
+      - Slug of the check to send the signal to, instead of its uuid.
+      - Slug pings are sent to C(<ping_api_base_url>/<ping_api_token>/<slug>), so C(ping_api_token)
+        must be set to the ping key of the project, and no management API request is needed
+        to find the uuid of the check.
+    type: str
+    version_added: 1.6.0
+  create:
+    description:
+      - Create the checks pinged by slug that do not exist yet, with the default settings of the project.
+      - Only used for the checks given by slug.
+    type: bool
+    default: false
+    version_added: 1.6.0
+  uuids:
+    description:
+      - Uuids of the checks to send C(signal) to.
+      - The signals are sent concurrently, see C(parallelism), over reused HTTP connections.
+    type: list
+    elements: str
+    version_added: 1.6.0
+  pings:
+    description:
+      - Signals to send to several checks, one item per signal.
+      - The signals of the same check are sent one after the other, in the order of the list.
+    type: list
+    elements: dict
+    version_added: 1.6.0
+    suboptions:
+      uuid:
+        description:
+          - Check uuid.
+          - Exactly one of C(uuid) and C(slug) is required.
+        type: str
+      slug:
+        description:
+          - Check slug, see the C(slug) option.
+        type: str
+      signal:
+        description:
+          - Type of signal to send, defaults to C(signal).
+        type: str
+        choices: ["success", "fail", "start"]
   signal:
     description:
       - Type of signal to send, C(success), C(fail) or C(start).
     type: str
     choices: ["success", "fail", "start"]
     default: success
+  exit_status:
+    description:
+      - Exit status of the job, sent instead of C(signal).
+      - C(0) is a success signal, any other value between C(1) and C(255) is a fail signal.
+    type: int
+    version_added: 1.6.0
+  run_id:
+    description:
+      - Run ID sent with the signal, a uuid identifying one run of the job.
+      - Healthchecks.io matches the start and the end signals that share a run ID to measure the
+        duration of each run, so runs of the same job that overlap are timed correctly.
+    type: str
+    version_added: 1.6.0
+  data:
+    description:
+      - Text sent as the body of the ping, for example the output of the job.
+      - With C(data) or C(data_file) the ping is a C(POST) request instead of a C(HEAD) request.
+      - Mutually exclusive with C(data_file).
+    type: str
+    version_added: 1.6.0
+  data_file:
+    description:
+      - Path of a file whose content is sent as the body of the ping, for example the log of the job.
+      - The file is streamed in chunks, it is never read into memory as a whole.
+      - The file is read on the host the signal is sent from, see C(ping_from).
+      - Mutually exclusive with C(data).
+    type: path
+    version_added: 1.6.0
+  max_body_size:
+    description:
+      - Maximum size of the ping body, in bytes.
+      - Longer C(data) or C(data_file) contents are truncated to their last C(max_body_size) bytes,
+        the end of a log usually tells the most about a failure.
+      - Healthchecks.io stores up to 100 kB of each ping body by default.
+    type: int
+    default: 100000
+    version_added: 1.6.0
+  parallelism:
+    description:
+      - Maximum number of checks signaled at the same time with C(uuids) or C(pings).
+    type: int
+    default: 1
+    version_added: 1.6.0
+  delivery:
+    description:
+      - C(direct) sends the signals right away and waits for the answers.
+      - C(spool) appends the signals to C(spool_file) and returns at once, without any network request.
+        The queued signals are sent later by the M(community.healthchecksio.ping_flush) module,
+        so a slow or unreachable ping API neither delays the task nor loses the signals.
+      - With C(spool), the C(data_file) is read when the signal is queued.
+    type: str
+    choices: ["direct", "spool"]
+    default: direct
+    version_added: 1.6.0
+  spool_file:
+    description:
+      - Path of the spool file used with C(delivery=spool), on the host the signal is sent from, see C(ping_from).
+    type: path
+    default: ~/.ansible/healthchecksio/ping-spool.jsonl
+    version_added: 1.6.0
+  ping_from:
+    description:
+      - Where the signal is sent from.
+      - C(controller) sends it directly from the Ansible controller, without transferring
+        and running the module on the target host, and reuses the HTTP connections within
+        the controller process (for example across the items of a loop).
+      - C(target) runs the module on the target host, like any other module.
+      - With C(controller), the environment variable fallbacks of the options are read on the controller.
+    type: str
+    choices: ["controller", "target"]
+    default: controller
+    version_added: 1.6.0
 extends_documentation_fragment:
   - community.healthchecksio.healthchecksio.documentation
 """
@@ -56,6 +172,38 @@ EXAMPLES = r"""
     state: present
     uuid: "{{ check_uuid }}"
     signal: start
+
+- name: Close the maintenance window of all the checks
+  community.healthchecksio.ping:
+    uuids: "{{ maintenance_check_uuids }}"
+    parallelism: 10
+
+- name: Send several signals in one task
+  community.healthchecksio.ping:
+    pings:
+      - uuid: "{{ backup_check_uuid }}"
+        signal: fail
+      - uuid: "{{ cleanup_check_uuid }}"
+      - slug: nightly-report
+
+- name: Report the exit status and the log of a backup run
+  community.healthchecksio.ping:
+    uuid: "{{ check_uuid }}"
+    exit_status: "{{ backup.rc }}"
+    run_id: "{{ run_id }}"
+    data_file: /var/log/backup.log
+    ping_from: target
+
+- name: Signal a check by slug, creating it on the first run
+  community.healthchecksio.ping:
+    slug: "{{ inventory_hostname }}-backup"
+    create: true
+    ping_api_token: "{{ ping_key }}"
+
+- name: Queue the signal, it is sent by the ping_flush module at the end of the play
+  community.healthchecksio.ping:
+    uuid: "{{ check_uuid }}"
+    delivery: spool
 """
 
 RETURN = r"""
@@ -64,37 +212,88 @@ msg:
   returned: always
   type: str
   sample: Sent success signal to 8597dcda-23d1-4e6b-b904-83df360bf8a8
+queued:
+  description: Number of signals appended to the spool file.
+  returned: when C(delivery=spool)
+  type: int
+  sample: 1
+  version_added: 1.6.0
+results:
+  description: One result per signal sent with C(uuids) or C(pings), in the same order.
+  returned: when C(uuids) or C(pings) is used
+  type: list
+  elements: dict
+  version_added: 1.6.0
+  contains:
+    uuid:
+      description: Check uuid.
+      returned: when the check is given by uuid
+      type: str
+      sample: 8597dcda-23d1-4e6b-b904-83df360bf8a8
+    slug:
+      description: Check slug.
+      returned: when the check is given by slug
+      type: str
+      sample: nightly-report
+    signal:
+      description: Type of signal.
+      returned: always
+      type: str
+      sample: success
+    exit_status:
+      description: Exit status sent instead of the signal.
+      returned: when C(exit_status) is set
+      type: int
+      sample: 0
+    status_code:
+      description: HTTP status code of the ping.
+      returned: unless in check mode
+      type: int
+      sample: 200
+    changed:
+      description: Whether the signal was sent.
+      returned: unless in check mode
+      type: bool
+    failed:
+      description: Whether the signal failed to be sent.
+      returned: unless in check mode
+      type: bool
+    msg:
+      description: Signal result message.
+      returned: unless in check mode
+      type: str
+      sample: Sent success signal to 8597dcda-23d1-4e6b-b904-83df360bf8a8
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  version_added: 1.6.0
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 1
 """
 
 from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
-    HealthchecksioHelper,
     Ping,
 )
 from ansible.module_utils.basic import AnsibleModule
 
 
 def run(module):
-    state = module.params.pop("state")
-    uuid = module.params.pop("uuid")
-    signal = module.params.pop("signal")
     ping = Ping(module)
-    if state == "present":
-        ping.create(uuid, signal)
+    ping.run()
 
 
 def main():
-    argument_spec = HealthchecksioHelper.healthchecksio_argument_spec()
-    argument_spec.update(
-        state=dict(type="str", choices=["present"], default="present"),
-        uuid=dict(type="str", required=True),
-        signal=dict(
-            type="str",
-            choices=["success", "fail", "start"],
-            required=False,
-            default="success",
-        ),
+    module = AnsibleModule(
+        argument_spec=Ping.argument_spec(),
+        mutually_exclusive=Ping.MUTUALLY_EXCLUSIVE,
+        required_one_of=Ping.REQUIRED_ONE_OF,
+        supports_check_mode=True,
     )
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
     run(module)
 
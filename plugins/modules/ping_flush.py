@@ -0,0 +1,124 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: ping_flush
+short_description: Send the signals queued by the ping module
+description:
+  - Sends the signals queued in the spool file by M(community.healthchecksio.ping) with C(delivery=spool).
+  - The signals of a check are sent in the order they were queued, different checks are signaled concurrently.
+  - A signal queued more than once for the same run ID is sent once.
+  - Signals that still fail after C(retries) retries stay in the spool file, together with the later
+    signals of the same check, and are sent by the next flush.
+  - The spool file is only locked while it is read and written back, so the ping module can queue
+    new signals while a flush is sending.
+author: "Mark Mercado (@mamercad)"
+version_added: 1.6.0
+options:
+  state:
+    description:
+      - C(present) will send the queued signals.
+    type: str
+    choices: ["present"]
+    default: present
+  spool_file:
+    description:
+      - Path of the spool file.
+      - Signals queued by the ping module from the controller, which is the default of its C(ping_from) option,
+        are in a spool file on the controller, use C(delegate_to=localhost) to flush them.
+    type: path
+    default: ~/.ansible/healthchecksio/ping-spool.jsonl
+  parallelism:
+    description:
+      - Maximum number of checks signaled at the same time.
+    type: int
+    default: 1
+  max_body_size:
+    description:
+      - Maximum size of the ping bodies, in bytes.
+    type: int
+    default: 100000
+extends_documentation_fragment:
+  - community.healthchecksio.healthchecksio.documentation
+"""
+
+EXAMPLES = r"""
+- name: Queue the signals of the hosts without waiting for the ping API
+  community.healthchecksio.ping:
+    uuid: "{{ check_uuid }}"
+    delivery: spool
+
+- name: Send the queued signals once, at the end of the play
+  community.healthchecksio.ping_flush:
+    parallelism: 10
+  delegate_to: localhost
+  run_once: true
+"""
+
+RETURN = r"""
+msg:
+  description: Flush result message.
+  returned: always
+  type: str
+  sample: Sent 12 signals, 0 still queued
+sent:
+  description: Number of signals sent.
+  returned: always
+  type: int
+  sample: 12
+pending:
+  description: Number of signals left in the spool file.
+  returned: always
+  type: int
+  sample: 0
+duplicates:
+  description: Number of signals dropped because they were queued more than once for the same run ID.
+  returned: when signals were queued
+  type: int
+  sample: 0
+results:
+  description: Results of the signals sent, see the C(results) of the ping module.
+  returned: when signals were queued
+  type: list
+  elements: dict
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 12
+"""
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    PingFlush,
+)
+from ansible.module_utils.basic import AnsibleModule
+
+
+def run(module):
+    flush = PingFlush(module)
+    flush.run()
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=PingFlush.argument_spec(), supports_check_mode=True
+    )
+
+    run(module)
+
+
+if __name__ == "__main__":
+    main()
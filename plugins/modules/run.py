@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Mark Mercado <mamercad@gmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: run
+short_description: Run a command and report it to a check
+description:
+  - Sends a start signal, runs a command, and sends its exit status with the end of its output
+    as the ping body, in a single task.
+  - Both signals share a run ID, so Healthchecks.io measures the duration of the run even when
+    runs of the same job overlap.
+  - The output (stdout and stderr, interleaved) is kept in a ring buffer of C(max_body_size)
+    bytes, so a command printing a lot uses a constant amount of memory.
+  - The command is not run through a shell, use C(argv) with C(sh -c) for pipes and redirections.
+author: "Mark Mercado (@mamercad)"
+version_added: 1.6.0
+options:
+  state:
+    description:
+      - C(present) will run the command and send the signals.
+    type: str
+    choices: ["present"]
+    default: present
+  uuid:
+    description:
+      - Uuid of the check to report to.
+      - Exactly one of C(uuid) and C(slug) is required.
+    type: str
+  slug:
+    description:
+      - Slug of the check to report to, instead of its uuid.
+      - Requires C(ping_api_token) to be set to the ping key of the project.
+    type: str
+  create:
+    description:
+      - Create the check given by C(slug) if it does not exist yet.
+    type: bool
+    default: false
+  cmd:
+    description:
+      - Command to run, split into arguments like a shell would.
+      - Exactly one of C(cmd) and C(argv) is required.
+    type: str
+  argv:
+    description:
+      - Command to run, as a list of arguments.
+    type: list
+    elements: str
+  chdir:
+    description:
+      - Directory the command is run in.
+    type: path
+  run_id:
+    description:
+      - Run ID sent with both signals, a random uuid is used by default.
+    type: str
+  max_body_size:
+    description:
+      - Number of bytes from the end of the output kept and sent as the ping body.
+      - Healthchecks.io stores up to 100 kB of each ping body by default.
+    type: int
+    default: 100000
+notes:
+  - The command always runs, in check mode the module is skipped.
+  - A command that exits with a non-zero status fails the task, after the status has been reported.
+extends_documentation_fragment:
+  - community.healthchecksio.healthchecksio.documentation
+"""
+
+EXAMPLES = r"""
+- name: Run the backup and report it to its check
+  community.healthchecksio.run:
+    uuid: "{{ backup_check_uuid }}"
+    argv:
+      - /usr/local/bin/backup
+      - --all
+
+- name: Run a pipeline, reporting to a check created on the first run
+  community.healthchecksio.run:
+    slug: "{{ inventory_hostname }}-logrotate"
+    create: true
+    ping_api_token: "{{ ping_key }}"
+    argv:
+      - sh
+      - -c
+      - logrotate /etc/logrotate.conf 2>&1 | tee /var/log/logrotate.last
+"""
+
+RETURN = r"""
+msg:
+  description: Result message.
+  returned: always
+  type: str
+  sample: Command exited with status 0
+rc:
+  description: Exit status of the command, C(null) when it could not be started.
+  returned: always
+  type: int
+  sample: 0
+run_id:
+  description: Run ID sent with the signals.
+  returned: always
+  type: str
+  sample: 5a2c0b4e-3f1d-4c8e-9b7a-6d5e4f3a2b1c
+duration:
+  description: Run time of the command, in seconds.
+  returned: always
+  type: float
+  sample: 12.345
+output:
+  description: End of the output of the command, as sent in the ping body.
+  returned: always
+  type: str
+  sample: "backup done\n"
+output_truncated:
+  description: Whether the output was longer than C(max_body_size).
+  returned: always
+  type: bool
+pings:
+  description: Results of the start and end signals, see the C(results) of the ping module.
+  returned: always
+  type: list
+  elements: dict
+api_stats:
+  description: Counters for the HTTP requests sent by the module.
+  returned: always
+  type: dict
+  contains:
+    requests:
+      description: Number of HTTP requests sent.
+      returned: always
+      type: int
+      sample: 2
+"""
+
+from ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio import (
+    Run,
+)
+from ansible.module_utils.basic import AnsibleModule
+
+
+def run(module):
+    job = Run(module)
+    job.run()
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=Run.argument_spec(),
+        mutually_exclusive=[("uuid", "slug"), ("cmd", "argv")],
+        required_one_of=[("uuid", "slug"), ("cmd", "argv")],
+        supports_check_mode=False,
+    )
+
+    run(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip("ansible.module_utils.common.arg_spec")
+
+from unittest.mock import MagicMock  # noqa: E402
+
+from ansible.errors import AnsibleActionFail  # noqa: E402
+
+from ansible_collections.community.healthchecksio.plugins.action.ping import (  # noqa: E402
+    ActionModule,
+)
+from ansible_collections.community.healthchecksio.tests.unit.plugins.stand_in import (
+    serve,
+)  # noqa: E402
+
+
+class PingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.server.hits.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def ping_server():
+    with serve(PingHandler, hits=[]) as server:
+        yield server
+
+
+def make_action(args):
+    task = MagicMock()
+    task.args = args
+    task.async_val = 0
+    task.check_mode = False
+    task.action = "community.healthchecksio.ping"
+    connection = MagicMock()
+    connection._shell.tmpdir = "/tmp/remote"
+    return ActionModule(task, connection, MagicMock(), MagicMock(), MagicMock())
+
+
+def test_ping_action_accepts_aliases(ping_server):
+    action = make_action(
+        dict(
+            api_key="token",
+            ping_api_base_url="http://127.0.0.1:{0}".format(ping_server.server_port),
+            uuid="abc",
+            signal="start",
+        )
+    )
+    result = action.run(task_vars={})
+    assert not result.get("failed"), result
+    assert result["changed"]
+    assert ping_server.hits == ["/abc/start"]
+
+
+def test_ping_action_runs_the_module_on_the_target():
+    action = make_action(dict(api_key="token", uuid="abc", ping_from="target"))
+    action._execute_module = MagicMock(return_value=dict(changed=True))
+    assert action.run(task_vars={})["changed"]
+    action._execute_module.assert_called_once()
+
+
+def test_ping_action_rejects_unknown_options():
+    action = make_action(dict(uuid="abc", bogus=1))
+    with pytest.raises(AnsibleActionFail, match="bogus"):
+        action.run(task_vars={})
@@ -0,0 +1,82 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import inventory_loader
+
+from ansible_collections.community.healthchecksio.tests.unit.plugins.stand_in import (
+    ChecksHandler,
+    serve,
+)
+
+
+@pytest.fixture
+def checks_api():
+    checks = [
+        dict(name="web", slug="web", status="up", tags="prod web", uuid="a"),
+        dict(name="db", slug="db", status="down", tags="prod", uuid="b"),
+        dict(name="", slug="", status="new", tags="", uuid="c"),
+    ]
+    with serve(ChecksHandler, hits=[], checks=checks) as server:
+        yield server
+
+
+@pytest.fixture
+def parse(checks_api, tmp_path):
+    path = tmp_path / "checks.healthchecksio.yml"
+    path.write_text(
+        json.dumps(
+            dict(
+                plugin="community.healthchecksio.checks",
+                management_api_token="token",
+                management_api_base_url="http://127.0.0.1:{0}".format(
+                    checks_api.server_port
+                ),
+                cache=True,
+                cache_plugin="ansible.builtin.jsonfile",
+                cache_connection=str(tmp_path / "cache"),
+            )
+        )
+    )
+
+    def parse():
+        inventory = InventoryData()
+        plugin = inventory_loader.get("community.healthchecksio.checks")
+        assert plugin.verify_file(str(path))
+        plugin.parse(inventory, DataLoader(), str(path))
+        plugin.update_cache_if_changed()
+        return inventory
+
+    return parse
+
+
+def test_checks_become_hosts_grouped_by_status_and_tag(parse, checks_api):
+    inventory = parse()
+
+    # The check without a name has no hostname and is skipped
+    assert sorted(inventory.hosts) == ["db", "web"]
+    assert inventory.get_host("web").vars["healthchecksio_uuid"] == "a"
+    assert inventory.get_host("db").vars["healthchecksio_status"] == "down"
+
+    def members(group):
+        return sorted(host.name for host in inventory.groups[group].get_hosts())
+
+    assert members("status_up") == ["web"]
+    assert members("status_down") == ["db"]
+    assert members("tag_prod") == ["db", "web"]
+    assert members("tag_web") == ["web"]
+    assert "status_new" not in inventory.groups
+    assert checks_api.hits == ["/checks/"]
+
+
+def test_inventory_cache_is_used_on_the_next_parse(parse, checks_api):
+    parse()
+    inventory = parse()
+    assert sorted(inventory.hosts) == ["db", "web"]
+    assert checks_api.hits == ["/checks/"]
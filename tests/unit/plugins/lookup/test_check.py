@@ -0,0 +1,83 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from ansible import constants as C
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.healthchecksio.plugins.lookup import check
+from ansible_collections.community.healthchecksio.tests.unit.plugins.stand_in import (
+    ChecksHandler,
+    serve,
+)
+
+
+@pytest.fixture
+def checks_api():
+    checks = [
+        dict(name="web", slug="web", tags="prod", ping_url="https://hc-ping.com/a"),
+        dict(name="db", slug="db", tags="prod db", ping_url="https://hc-ping.com/b"),
+        dict(name="dup", slug="dup-1", tags="", uuid="c"),
+        dict(name="dup", slug="dup-2", tags="", uuid="d"),
+    ]
+    with serve(ChecksHandler, hits=[], checks=checks) as server:
+        yield server
+
+
+@pytest.fixture
+def lookup(checks_api, tmp_path, monkeypatch):
+    monkeypatch.setattr(C, "DEFAULT_LOCAL_TMP", str(tmp_path))
+    monkeypatch.setattr(check, "_MEMO", {})
+
+    def run(*terms, **kwargs):
+        kwargs.setdefault("management_api_token", "token")
+        kwargs.setdefault(
+            "management_api_base_url",
+            "http://127.0.0.1:{0}".format(checks_api.server_port),
+        )
+        plugin = lookup_loader.get("community.healthchecksio.check")
+        return plugin.run(list(terms), variables={}, **kwargs)
+
+    return run
+
+
+def test_checks_are_fetched_once_per_run(lookup, checks_api, tmp_path):
+    assert lookup("web") == ["a"]
+    assert lookup("db", output="ping_url") == ["https://hc-ping.com/b"]
+    assert lookup("prod", key="tag") == ["a", "b"]
+    assert lookup("dup-2", key="slug", output="record")[0]["uuid"] == "d"
+    assert checks_api.hits == ["/checks/"]
+
+    # Another fork of the run reads the memo file
+    check._MEMO.clear()
+    assert lookup("c", key="uuid") == ["c"]
+    assert checks_api.hits == ["/checks/"]
+    memo_files = [
+        name
+        for name in os.listdir(str(tmp_path))
+        if name.startswith("healthchecksio-checks-") and not name.endswith(".lock")
+    ]
+    assert len(memo_files) == 1
+
+    assert lookup("web", invalidate=True) == ["a"]
+    assert checks_api.hits == ["/checks/"] * 2
+
+
+def test_checks_are_fetched_again_once_stale(lookup, checks_api):
+    lookup("web", cache_ttl=0)
+    lookup("web", cache_ttl=0)
+    assert checks_api.hits == ["/checks/"] * 2
+
+
+def test_terms_must_match_one_check(lookup):
+    with pytest.raises(AnsibleLookupError, match="No check found with name nope"):
+        lookup("nope")
+    with pytest.raises(
+        AnsibleLookupError, match="Expected to find one check with name dup, 2 found"
+    ):
+        lookup("dup")
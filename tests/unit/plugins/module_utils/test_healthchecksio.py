@@ -2,6 +2,1158 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import gzip
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+import tracemalloc
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+healthchecksio = pytest.importorskip(
+    "ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio"
+)
+from ansible_collections.community.healthchecksio.tests.unit.plugins.stand_in import (
+    serve,
+)  # noqa: E402
+
+
+class ExitJson(Exception):
+    pass
+
+
+class FailJson(Exception):
+    pass
+
+
+class FakeModule(object):
+    def __init__(self, **params):
+        self.params = params
+        self.tmpdir = None
+        self.check_mode = False
+
+    def jsonify(self, data):
+        return json.dumps(data)
+
+    def fail_json(self, **kwargs):
+        raise FailJson(kwargs)
+
+    def exit_json(self, **kwargs):
+        raise ExitJson(kwargs)
+
+    def debug(self, msg):
+        pass
+
+    def atomic_move(self, src, dest):
+        os.rename(src, dest)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every request with its path; paths containing "fail" get a 500.
+
+    Paths containing "etag" are served with an ETag, and a 304 when it matches.
+    Paths containing "gzip" get a long, compressed answer, and paths containing
+    "moved" are redirected to the same path with "here" instead. Once
+    ``server.checks`` is set, "/checks/" answers with it as the listing, and
+    the same goes for "/checks/<uuid>/flips/" and ``server.flips``, with the
+    start and end parameters applied, and for "/channels" and
+    ``server.channels``. A check definition posted to "/checks/" is answered
+    with a 201, one posted to "/checks/<uuid>" with a 200, both with the
+    definition and its ping_url.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _answer(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.server.bodies[self.path] = self.rfile.read(length) if length else b""
+        time.sleep(self.server.delay + random.uniform(0, 0.02))
+        self.server.hits.append(self.path)
+        status = 500 if "fail" in self.path else 200
+        if "throttle" in self.path and self.server.hits.count(self.path) <= 2:
+            status = 429
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        try:
+            sent = json.loads(self.server.bodies[self.path] or b"{}")
+        except ValueError:
+            sent = None
+        if self.command == "POST" and isinstance(sent, dict) and "name" in sent:
+            uuid = self.path.rstrip("/").split("/")[-1]
+            if uuid == "checks":
+                status, uuid = 201, "new-" + sent["name"]
+            sent["ping_url"] = "https://hc-ping.com/" + uuid
+            body = json.dumps(sent).encode("utf-8")
+        if self.server.channels is not None and self.path == "/channels":
+            body = json.dumps({"channels": self.server.channels}).encode("utf-8")
+        listing = self.command == "GET" and (
+            self.path.split("?")[0].rstrip("/") == "/checks"
+        )
+        if self.server.checks is not None and listing:
+            body = json.dumps({"checks": self.server.checks}).encode("utf-8")
+        flips = re.match(r"/checks/([^/?]+)/flips/?(\?.*)?$", self.path)
+        if self.server.flips is not None and flips:
+            query = dict(
+                part.split("=")
+                for part in (flips.group(2) or "?")[1:].split("&")
+                if part
+            )
+            body = json.dumps(
+                [
+                    flip
+                    for flip in self.server.flips.get(flips.group(1), [])
+                    if int(query.get("start", 0)) <= flip["ts"]
+                    and flip["ts"] < int(query.get("end", 2**40))
+                ]
+            ).encode("utf-8")
+        if "etag" in self.path and self.headers.get("If-None-Match") == '"v1"':
+            status, body = 304, b""
+        gzipped = "gzip" in self.path and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        if gzipped:
+            body = gzip.compress(
+                json.dumps({"path": self.path, "checks": [{}] * 10000}).encode("utf-8")
+            )
+        if "moved" in self.path:
+            status, body = 301, b""
+        self.send_response(status)
+        if status == 301:
+            self.send_header("Location", self.path.replace("moved", "here"))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        if "etag" in self.path:
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = do_HEAD = _answer
+
+
+@pytest.fixture
+def stand_in():
+    with serve(
+        StandInHandler,
+        hits=[],
+        bodies={},
+        delay=0,
+        checks=None,
+        flips=None,
+        channels=None,
+    ) as server:
+        yield server
+
+
+def make_helper(server, **params):
+    params.setdefault(
+        "management_api_base_url", "http://127.0.0.1:{0}".format(server.server_port)
+    )
+    params.setdefault("management_api_token", "token")
+    params.setdefault("token_validation", "none")
+    return healthchecksio.HealthchecksioHelper(FakeModule(**params))
+
 
 def test_healthchecksio_placeholder():
     assert True
+
+
+def test_run_concurrently_keeps_input_order():
+    def slow_square(n):
+        time.sleep(random.uniform(0, 0.01))
+        return n * n
+
+    results = healthchecksio.run_concurrently(slow_square, range(50), parallelism=8)
+    assert results == [n * n for n in range(50)]
+
+
+def test_run_concurrently_bounds_parallelism():
+    lock = threading.Lock()
+    state = dict(running=0, peak=0)
+
+    def track(n):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return n
+
+    healthchecksio.run_concurrently(track, range(30), parallelism=3)
+    assert state["peak"] <= 3
+
+
+def test_run_concurrently_raises_worker_errors_in_the_caller():
+    started = []
+
+    def check(n):
+        started.append(n)
+        if n == 3:
+            raise ValueError("bad item")
+        time.sleep(0.01)
+        return n
+
+    with pytest.raises(ValueError, match="bad item"):
+        healthchecksio.run_concurrently(check, range(50), parallelism=4)
+    # The items after the error are not started
+    assert len(started) < 50
+
+
+def test_concurrent_sends_keep_order_and_survive_failures(stand_in):
+    helper = make_helper(stand_in)
+    paths = ["checks/{0}".format(n) for n in range(20)]
+    paths[5] = "checks/fail"
+
+    responses = healthchecksio.run_concurrently(
+        lambda path: helper.post(path, {}), paths, parallelism=6
+    )
+
+    assert [r.status_code for r in responses].count(500) == 1
+    assert responses[5].status_code == 500
+    assert [r.json["path"] for r in responses if r.status_code == 200] == [
+        "/" + path for path in paths if path != "checks/fail"
+    ]
+    assert helper.stats["requests"] == 20
+
+
+def test_concurrent_sends_fail_fast_skips_the_rest(stand_in):
+    helper = make_helper(stand_in)
+    paths = ["checks/fail"] + ["checks/{0}".format(n) for n in range(20)]
+
+    responses = healthchecksio.run_concurrently(
+        lambda path: helper.post(path, {}),
+        paths,
+        parallelism=1,
+        fail_fast=True,
+        is_failure=lambda response: response.status_code != 200,
+    )
+
+    assert responses[0].status_code == 500
+    assert responses[1:] == [None] * 20
+    assert stand_in.hits == ["/checks/fail"]
+
+
+def test_keep_alive_reuses_one_connection(stand_in):
+    helper = make_helper(stand_in, keep_alive=True)
+
+    for n in range(5):
+        assert helper.get("checks/{0}".format(n)).json == {
+            "path": "/checks/{0}".format(n)
+        }
+    assert helper.post("checks/fail", {}).status_code == 500
+    assert helper.head("ping", no_headers=True).status_code == 200
+
+    assert helper.stats["requests"] == 7
+    assert helper.stats["connections_opened"] == 1
+    assert helper.stats["connections_reused"] == 6
+
+
+@pytest.mark.parametrize("keep_alive", [False, True])
+def test_redirects_are_followed(stand_in, keep_alive):
+    helper = make_helper(stand_in, keep_alive=keep_alive)
+    response = helper.get("checks/moved")
+    assert response.status_code == 200
+    assert response.json == {"path": "/checks/here"}
+    assert stand_in.hits[0] == "/checks/moved"
+    assert stand_in.hits[-1] == "/checks/here"
+
+
+def test_timed_out_requests_are_not_sent_again(stand_in):
+    helper = make_helper(stand_in, keep_alive=True, retries=0, timeout=1)
+    assert helper.get("checks/1").status_code == 200
+
+    # Answered too late on the reused connection, the server did get it
+    stand_in.delay = 1.5
+    response = helper.post("checks/", dict(name="web"))
+    assert response.status_code == -1
+    time.sleep(2)
+    assert stand_in.hits == ["/checks/1", "/checks/"]
+    assert helper.stats["requests"] == 2
+
+
+def make_ping(server, **params):
+    params.setdefault(
+        "ping_api_base_url", "http://127.0.0.1:{0}/ping".format(server.server_port)
+    )
+    params.setdefault("ping_api_token", "")
+    params.setdefault("management_api_token", "token")
+    params.setdefault("signal", "success")
+    params.setdefault("parallelism", 8)
+    return healthchecksio.Ping(FakeModule(**params))
+
+
+def test_ping_many_reports_per_uuid(stand_in):
+    uuids = ["check-{0}".format(n) for n in range(30)]
+    uuids[7] = "check-fail"
+
+    with pytest.raises(FailJson) as e:
+        make_ping(stand_in).create_many([dict(uuid=uuid) for uuid in uuids])
+
+    result = e.value.args[0]
+    assert result["msg"] == "Failed to send 1 of 30 signals"
+    assert [r["uuid"] for r in result["results"]] == uuids
+    assert [r["uuid"] for r in result["results"] if r["failed"]] == ["check-fail"]
+    assert sorted(stand_in.hits) == sorted("/ping/" + uuid for uuid in uuids)
+    assert result["api_stats"]["requests"] == 30
+    assert result["api_stats"]["connections_opened"] <= 8
+
+
+def test_ping_many_keeps_the_order_of_one_check(stand_in):
+    pings = []
+    for n in range(10):
+        pings.append(dict(uuid="check-{0}".format(n), signal="start"))
+    for n in range(10):
+        pings.append(dict(uuid="check-{0}".format(n), signal=None))
+
+    with pytest.raises(ExitJson) as e:
+        make_ping(stand_in).create_many(pings)
+
+    assert e.value.args[0]["changed"] is True
+    for n in range(10):
+        check_hits = [
+            hit for hit in stand_in.hits if hit.startswith("/ping/check-{0}".format(n))
+        ]
+        assert check_hits == [
+            "/ping/check-{0}/start".format(n),
+            "/ping/check-{0}".format(n),
+        ]
+
+
+def test_ping_by_slug_uses_the_ping_key(stand_in):
+    pings = [dict(slug="backup"), dict(slug="report", signal="start"), dict(uuid="u")]
+
+    with pytest.raises(ExitJson) as e:
+        make_ping(stand_in, ping_api_token="key", create=True).create_many(pings)
+
+    assert sorted(stand_in.hits) == [
+        "/ping/key/backup?create=1",
+        "/ping/key/report/start?create=1",
+        "/ping/u",
+    ]
+    assert [r["msg"] for r in e.value.args[0]["results"]] == [
+        "Sent success signal to backup",
+        "Sent start signal to report/start",
+        "Sent success signal to u",
+    ]
+
+
+def test_ping_by_slug_requires_the_ping_key(stand_in):
+    with pytest.raises(FailJson):
+        make_ping(stand_in).create(None, "success", slug="backup")
+    assert stand_in.hits == []
+
+
+@pytest.mark.parametrize(
+    "command, msg",
+    [
+        (dict(cmd=""), "cmd or argv must name the command to run"),
+        (dict(cmd="  "), "cmd or argv must name the command to run"),
+        (dict(argv=[]), "cmd or argv must name the command to run"),
+        (dict(cmd="echo 'oops"), "Failed to parse cmd: No closing quotation"),
+    ],
+)
+def test_run_needs_a_command(stand_in, command, msg):
+    run = healthchecksio.Run(
+        FakeModule(
+            ping_api_base_url="http://127.0.0.1:{0}/ping".format(stand_in.server_port),
+            ping_api_token="",
+            management_api_token="token",
+            uuid="abc",
+            max_body_size=100,
+            **command,
+        )
+    )
+    with pytest.raises(FailJson) as error:
+        run.run()
+    assert error.value.args[0]["msg"] == msg
+    assert stand_in.hits == []
+
+
+def test_ping_streams_the_tail_of_the_data_file(stand_in, tmp_path):
+    log = tmp_path / "job.log"
+    log.write_bytes(b"".join(b"line %05d\n" % n for n in range(20000)))
+
+    with pytest.raises(ExitJson) as e:
+        make_ping(
+            stand_in,
+            data_file=str(log),
+            max_body_size=22,
+            exit_status=3,
+            run_id="0c3a1d1e-6d5e-4a7f-9a3b-1f2e3d4c5b6a",
+        ).create("u", "success")
+
+    path = "/ping/u/3?rid=0c3a1d1e-6d5e-4a7f-9a3b-1f2e3d4c5b6a"
+    assert stand_in.hits == [path]
+    assert stand_in.bodies[path] == b"line 19998\nline 19999\n"
+    assert e.value.args[0]["msg"] == "Sent exit status 3 to u/3"
+
+
+def test_ring_buffer_keeps_the_last_bytes():
+    buffer = healthchecksio.RingBuffer(10)
+    for n in range(1000):
+        buffer.write(b"%d," % n)
+
+    assert buffer.getvalue() == b"7,998,999,"
+    assert buffer.truncated
+    assert buffer.size < 10 + len(b"999,")
+
+
+def make_flush(server, spool_file, **params):
+    params.setdefault(
+        "ping_api_base_url", "http://127.0.0.1:{0}/ping".format(server.server_port)
+    )
+    params.setdefault("ping_api_token", "")
+    params.setdefault("management_api_token", "token")
+    params.setdefault("parallelism", 4)
+    params.setdefault("retries", 1)
+    params.setdefault("retry_delay", 0)
+    params.setdefault("max_body_size", 100000)
+    params["spool_file"] = spool_file
+    return healthchecksio.PingFlush(FakeModule(**params))
+
+
+def test_spooled_pings_return_before_a_slow_server_answers(stand_in, tmp_path):
+    stand_in.delay = 0.5
+    spool_file = str(tmp_path / "spool.jsonl")
+
+    started = time.time()
+    with pytest.raises(ExitJson):
+        make_ping(stand_in, spool_file=spool_file).queue([dict(uuid="u")])
+    assert time.time() - started < stand_in.delay
+    assert stand_in.hits == []
+
+    started = time.time()
+    with pytest.raises(ExitJson):
+        make_ping(stand_in).create("u", "success")
+    assert time.time() - started >= stand_in.delay
+
+
+def test_flush_keeps_order_per_check_and_drops_duplicate_runs(stand_in, tmp_path):
+    spool_file = str(tmp_path / "spool.jsonl")
+    queued = [
+        dict(uuid="a", signal="start"),
+        dict(uuid="check-fail", signal="start"),
+        dict(uuid="a", signal="success"),
+        dict(uuid="check-fail", signal="success"),
+        dict(uuid="a", signal="success"),
+    ]
+    with pytest.raises(ExitJson):
+        make_ping(stand_in, spool_file=spool_file, run_id="r1").queue(queued)
+
+    with pytest.raises(ExitJson) as e:
+        make_flush(stand_in, spool_file).run()
+
+    result = e.value.args[0]
+    assert (result["sent"], result["pending"], result["duplicates"]) == (2, 2, 1)
+    assert [hit for hit in stand_in.hits if "/a" in hit] == [
+        "/ping/a/start?rid=r1",
+        "/ping/a?rid=r1",
+    ]
+    # Retried once, and the success waiting behind the failed start not sent
+    assert [hit for hit in stand_in.hits if "check-fail" in hit] == [
+        "/ping/check-fail/start?rid=r1"
+    ] * 2
+
+    with open(spool_file) as f:
+        pending = [json.loads(line) for line in f]
+    assert [(p["uuid"], p["signal"]) for p in pending] == [
+        ("check-fail", "start"),
+        ("check-fail", "success"),
+    ]
+
+
+def test_retries_follow_retry_after_and_skip_unsafe_posts(stand_in):
+    helper = make_helper(stand_in, retries=3, retry_delay=10.0)
+
+    # Retry-After: 0 wins over retry_delay, and a 429 is retried for any method
+    assert helper.post("checks/throttle", {}).status_code == 200
+    assert helper.stats["retries"] == 2
+    assert helper.stats["backoff_seconds"] == 0
+
+    helper = make_helper(stand_in, retries=2, retry_delay=0.01, retry_jitter=0)
+    assert helper.post("checks/fail", {}).status_code == 500
+    assert helper.get("checks/fail").status_code == 500
+    assert helper.post("checks/fail", {"unique": ["name"]}).status_code == 500
+    assert helper.stats["requests"] == 1 + 3 + 3
+    assert helper.stats["retries"] == 4
+    assert helper.stats["backoff_seconds"] == pytest.approx(4 * 0.015, abs=0.001)
+
+    # An explicit retry_safe=False wins over unique
+    helper = make_helper(stand_in, retries=2, retry_delay=0.01)
+    response = helper.post("checks/fail", {"unique": ["name"]}, retry_safe=False)
+    assert response.status_code == 500
+    assert helper.stats["requests"] == 1
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        (dict(retries=-1), "retries must be at least 0"),
+        (dict(retry_delay=-0.5), "retry_delay must be at least 0"),
+        (dict(retry_max_delay=-1.0), "retry_max_delay must be at least 0"),
+        (dict(retry_jitter=1.5), "retry_jitter must be between 0 and 1"),
+        (dict(retry_jitter=-0.1), "retry_jitter must be between 0 and 1"),
+    ],
+)
+def test_retry_options_out_of_range_fail(stand_in, params, message):
+    with pytest.raises(FailJson) as e:
+        make_helper(stand_in, **params)
+    assert e.value.args[0]["msg"] == message
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        (dict(rate_limit=-1.0), "rate_limit must be at least 0"),
+        (
+            dict(rate_limit=2.0, rate_limit_burst=0),
+            "rate_limit_burst must be at least 1",
+        ),
+    ],
+)
+def test_rate_limit_options_out_of_range_fail(stand_in, params, message):
+    with pytest.raises(FailJson) as e:
+        make_helper(stand_in, **params)
+    assert e.value.args[0]["msg"] == message
+
+
+def test_response_cache_serves_reads_until_a_change(stand_in, tmp_path):
+    def helper():
+        return make_helper(
+            stand_in, cache_ttl=60, cache_max_size=10000, cache_dir=str(tmp_path)
+        )
+
+    # Every host of a play builds its own helper, they share the cache
+    for dummy in range(5):
+        assert helper().get("checks/").json == {"path": "/checks/"}
+    assert stand_in.hits == ["/checks/"]
+
+    # Any change fetches everything again, errors are not cached
+    assert helper().post("checks/", {}).status_code == 200
+    assert helper().get("checks/").status_code == 200
+    assert helper().get("checks/fail").status_code == 500
+    assert helper().get("checks/fail").status_code == 500
+    assert stand_in.hits[1:] == ["/checks/", "/checks/", "/checks/fail", "/checks/fail"]
+
+    last = helper()
+    last.get("checks/")
+    assert last.stats["cache_hits"] == 1
+
+    # Entries expire, and the least recently used go first over the size limit
+    expired = helper()
+    cache = expired.cache
+    cache.ttl = 0
+    expired.get("checks/")
+    assert stand_in.hits[-1] == "/checks/"
+
+    cache.ttl = 60
+    cache.max_size = 1
+    cache.set("a", {}, cache.generation())
+    assert cache.get("a") is None
+    cache.invalidate()
+    cache.max_size = 10000
+    cache.set("a", {}, cache.generation())
+    cache.max_size = os.path.getsize(cache._entry_path("a")) * 5 // 2
+    cache.set("b", {}, cache.generation())
+    # a is the oldest entry until it is read again
+    os.utime(cache._entry_path("a"), (1, 1))
+    os.utime(cache._entry_path("b"), (2, 2))
+    cache.get("a")
+    cache.set("c", {}, cache.generation())
+    assert cache.get("a")["data"] == {}
+    assert cache.get("b") is None
+
+
+def test_cache_is_listed_once_and_skips_streamed_listings(
+    stand_in, tmp_path, monkeypatch
+):
+    helper = make_helper(
+        stand_in, cache_ttl=60, cache_max_size=10**6, cache_dir=str(tmp_path)
+    )
+    listed = []
+    listdir = os.listdir
+
+    def counting_listdir(path):
+        listed.append(path)
+        return listdir(path)
+
+    monkeypatch.setattr(healthchecksio.os, "listdir", counting_listdir)
+    for n in range(50):
+        helper.get("checks/{0}".format(n))
+    # The directory did not exist yet, there was nothing to list
+    assert listed == []
+
+    # Over the limit the oldest entries go, until there is room for a few more
+    cache = helper.cache
+    size = os.path.getsize(cache._entry_path("checks/0"))
+    cache.max_size = size * 20
+    helper.get("checks/50")
+    assert len(listed) == 1
+    helper.get("checks/51")
+    assert len(listed) == 1
+    assert cache._usage() <= cache.max_size
+
+    response = helper.get("checks/gzip", stream=True)
+    assert sum(1 for check in response.iter_items("checks")) == 10000
+    assert cache.get("checks/gzip") is None
+    assert "cache_hits" not in helper.stats
+
+
+@pytest.mark.parametrize("keep_alive", [False, True])
+def test_stale_cache_entries_are_revalidated(stand_in, tmp_path, keep_alive):
+    helper = make_helper(
+        stand_in,
+        cache_ttl=60,
+        cache_max_size=10000,
+        cache_dir=str(tmp_path),
+        keep_alive=keep_alive,
+    )
+    assert helper.get("checks/etag").json == {"path": "/checks/etag"}
+    helper.cache.ttl = 0
+
+    for dummy in range(3):
+        response = helper.get("checks/etag")
+        assert response.status_code == 200
+        assert response.body is None
+        assert response.json == {"path": "/checks/etag"}
+    assert stand_in.hits == ["/checks/etag"] * 4
+    assert helper.stats["cache_misses"] == 1
+    assert helper.stats["cache_hits"] == 3
+    assert helper.stats["cache_revalidations"] == 3
+
+
+@pytest.mark.parametrize("keep_alive", [False, True])
+def test_compressed_answers_are_decoded(stand_in, keep_alive):
+    helper = make_helper(stand_in, keep_alive=keep_alive)
+    response = helper.get("checks/gzip")
+    assert response.json["path"] == "/checks/gzip"
+    assert len(response.json["checks"]) == 10000
+    assert helper.stats["bytes_decoded"] == len(response.body)
+    assert helper.stats["bytes_received"] * 10 < helper.stats["bytes_decoded"]
+
+    response = helper.get("checks/gzip/fail")
+    assert response.status_code == 500
+    assert response.json["path"] == "/checks/gzip/fail"
+
+
+def test_response_parses_once_and_can_drop_the_body():
+    response = healthchecksio.Response(
+        io.BytesIO(b'{"checks": []}'), dict(status=200, url="checks")
+    )
+    assert response.json is response.json
+    assert response.body == b'{"checks": []}'
+    assert not hasattr(response, "__dict__")
+
+    response = healthchecksio.Response(
+        io.BytesIO(b'{"checks": []}'), dict(status=200, url="checks")
+    )
+    response.release_body()
+    assert response.body is None
+    assert response.json == {"checks": []}
+
+    error = healthchecksio.Response(None, dict(status=401, body=b'{"error": "no"}'))
+    error.release_body()
+    assert error.json == {"error": "no"}
+
+
+@pytest.mark.parametrize("keep_alive", [False, True])
+def test_listings_can_be_streamed(stand_in, keep_alive):
+    helper = make_helper(stand_in, keep_alive=keep_alive)
+    response = helper.get("checks/gzip", stream=True)
+    assert response.status_code == 200
+    assert sum(1 for check in response.iter_items("checks")) == 10000
+    assert response.body is None
+
+
+def test_pooled_streams_give_the_connection_back_once_read(stand_in):
+    helper = make_helper(stand_in, keep_alive=True)
+    response = helper.get("checks/gzip", stream=True)
+    # The body is still on the wire, the next request needs a connection of its own
+    assert helper.get("checks/1").status_code == 200
+    assert helper.stats["connections_opened"] == 2
+
+    assert sum(1 for check in response.iter_items("checks")) == 10000
+    assert helper.get("checks/2").status_code == 200
+    assert helper.get("checks/3").status_code == 200
+    assert helper.stats["connections_opened"] == 2
+    assert helper.stats["connections_reused"] == 2
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7])
+def test_streamed_numbers_survive_chunk_boundaries(chunk_size):
+    items = [1.5, 2, -3e-2, 12.25e3, 7e5, 0, True, None, "1.5", [4.5]]
+    for document, key in [(items, None), ({"n": 1.5, "items": items}, "items")]:
+        fileobj = io.BytesIO(json.dumps(document).encode("utf-8"))
+        streamed = list(healthchecksio.iter_json_items(fileobj, key, chunk_size))
+        assert streamed == items
+        assert [type(item) for item in streamed] == [type(item) for item in items]
+
+
+def test_streamed_items_use_a_fraction_of_the_memory():
+    document = json.dumps(
+        {
+            "checks": [
+                {"name": "check-{0}".format(i), "tags": "a b"} for i in range(20000)
+            ]
+        }
+    ).encode("utf-8")
+
+    def peak(use):
+        response = healthchecksio.Response(
+            io.BytesIO(document), dict(status=200), stream=True
+        )
+        tracemalloc.start()
+        try:
+            use(response)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    parsed = peak(lambda response: len(response.json["checks"]))
+    streamed = peak(lambda response: sum(1 for c in response.iter_items("checks")))
+    assert streamed * 10 < parsed
+
+
+def test_checks_info_filters_and_projects_while_reading(stand_in):
+    stand_in.checks = [
+        dict(name="backup-db", slug="backup-db", status="down", uuid="1", tags="db"),
+        dict(name="backup-www", slug="backup-www", status="up", uuid="2", tags=""),
+        dict(name="web", slug="web", status="down", uuid="3", tags=""),
+    ]
+
+    def checks_info(**params):
+        module = FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+            management_api_token="token",
+            token_validation="none",
+            **params,
+        )
+        with pytest.raises(ExitJson) as result:
+            healthchecksio.ChecksInfo(module).get()
+        return result.value.args[0]["data"]["checks"]
+
+    assert checks_info(status=["down"], fields=["uuid", "status"]) == [
+        dict(uuid="1", status="down"),
+        dict(uuid="3", status="down"),
+    ]
+    assert [c["uuid"] for c in checks_info(name_regex="^backup-")] == ["1", "2"]
+    assert [c["uuid"] for c in checks_info(slug="web")] == ["3"]
+    assert stand_in.hits[-1] == "/checks?slug=web"
+
+    with pytest.raises(FailJson):
+        checks_info(name_regex="(")
+
+
+def test_pings_of_many_checks_report_per_check_errors(stand_in):
+    stand_in.checks = [dict(uuid="a"), dict(uuid="b"), dict(uuid="a")]
+
+    def pings_info(**params):
+        module = FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+            management_api_token="token",
+            token_validation="lazy",
+            retries=0,
+            parallelism=4,
+            **params,
+        )
+        with pytest.raises(ExitJson) as result:
+            healthchecksio.ChecksPingsInfo(module).get()
+        return result.value.args[0]
+
+    result = pings_info(uuids=["x", "fail", "y", "x"])
+    assert list(result["results"]) == ["x", "fail", "y"]
+    assert result["results"]["x"]["data"] == {"path": "/checks/x/pings/"}
+    assert result["results"]["fail"]["failed"]
+    assert result["results"]["fail"]["status_code"] == 500
+    assert result["msg"] == "Failed to get the pings of 1 of 3 checks"
+
+    result = pings_info(tags=["db"])
+    assert stand_in.hits[-3] == "/checks/?tag=db"
+    assert sorted(result["results"]) == ["a", "b"]
+    assert result["msg"] == "Got the pings of 2 checks"
+
+
+def test_flips_state_file_only_returns_new_flips(stand_in, tmp_path):
+    def flip(ts, up):
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(ts))
+        return dict(timestamp=timestamp, up=up, ts=ts)
+
+    stand_in.flips = dict(a=[flip(100, 0), flip(200, 1)], b=[flip(150, 0)])
+    state_file = str(tmp_path / "state" / "flips.json")
+
+    def flips_info(**params):
+        module = FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+            management_api_token="token",
+            token_validation="none",
+            state_file=state_file,
+            **params,
+        )
+        with pytest.raises(ExitJson) as result:
+            healthchecksio.ChecksFlipsInfo(module).get()
+        return result.value.args[0]
+
+    def flip_times(result):
+        return dict(
+            (uuid, [flip["ts"] for flip in check["data"]])
+            for uuid, check in result["results"].items()
+        )
+
+    assert flip_times(flips_info(uuids=["a", "b"])) == dict(a=[100, 200], b=[150])
+    assert json.load(open(state_file)) == dict(checks=dict(a=200, b=150))
+
+    stand_in.flips["a"].append(flip(300, 0))
+    assert flip_times(flips_info(uuids=["a", "b"])) == dict(a=[300], b=[])
+    assert "/checks/a/flips/?start=200" in stand_in.hits
+
+    # A window still applies, and the single check mode shares the state
+    assert flips_info(uuid="a", end=250)["data"] == []
+    assert [f["ts"] for f in flips_info(uuid="b", seconds=10**10)["data"]] == []
+    assert stand_in.hits[-1] == "/checks/b/flips/?seconds=10000000000&start=150"
+
+
+def test_unreadable_flips_fail_their_check_only(stand_in, tmp_path):
+    def flip(ts, up):
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(ts))
+        return dict(timestamp=timestamp, up=up, ts=ts)
+
+    stand_in.flips = dict(
+        a=[flip(100, 0)], b=[dict(timestamp="yesterday", up=1, ts=150)]
+    )
+
+    def flips_info(cls=healthchecksio.ChecksFlipsInfo, **params):
+        module = FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+            management_api_token="token",
+            token_validation="none",
+            retries=0,
+            parallelism=4,
+            **params,
+        )
+        with pytest.raises(ExitJson) as result:
+            cls(module).get()
+        return result.value.args[0]
+
+    state_file = str(tmp_path / "state.json")
+    result = flips_info(uuids=["a", "b"], state_file=state_file)
+    assert [f["ts"] for f in result["results"]["a"]["data"]] == [100]
+    assert result["results"]["b"] == dict(
+        failed=True,
+        status_code=-1,
+        msg="Failed to get checks/b/flips/: Invalid timestamp: yesterday",
+    )
+
+    dest = tmp_path / "flips.jsonl"
+    result = flips_info(uuids=["b", "a"], dest=str(dest), state_file=state_file)
+    assert result["results"]["b"]["failed"]
+    assert result["results"]["b"]["records"] == 0
+    assert result["records"] == 0
+    assert result["msg"].endswith("failed to get the flips of 1 checks")
+
+    result = flips_info(
+        cls=healthchecksio.ChecksAvailabilityInfo,
+        uuids=["a", "b"],
+        start=0,
+        end=200,
+    )
+    assert result["results"]["a"]["uptime_percent"] == 50.0
+    assert result["results"]["b"]["failed"]
+    assert result["msg"] == "Failed to get the flips of 1 of 2 checks"
+
+
+def test_summarize_flips_clips_intervals_to_the_window():
+    summary = healthchecksio.summarize_flips(
+        [(0, True), (200, False), (250, True), (300, True), (900, False)],
+        100,
+        1100,
+        False,
+    )
+    assert summary == dict(
+        uptime_percent=65.0,
+        downtime_seconds=350,
+        flips=4,
+        outages=2,
+        mttr_seconds=150.0,
+        down_intervals=[[100, 250], [900, 1100]],
+    )
+    assert healthchecksio.summarize_flips([], 0, 100, True)["uptime_percent"] == 100
+
+
+def test_availability_of_many_checks(stand_in):
+    def flip(ts, up):
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(ts))
+        return dict(timestamp=timestamp, up=up, ts=ts)
+
+    stand_in.checks = [
+        dict(uuid="a", status="up"),
+        dict(uuid="b", status="down"),
+        dict(uuid="c", status="up"),
+    ]
+    stand_in.flips = dict(a=[flip(1500, 1), flip(1000, 0)])
+    module = FakeModule(
+        management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+        management_api_token="token",
+        token_validation="none",
+        retries=0,
+        parallelism=4,
+        start=0,
+        end=2000,
+        uuids=["a", "b", "fail"],
+    )
+    with pytest.raises(ExitJson) as result:
+        healthchecksio.ChecksAvailabilityInfo(module).get()
+    result = result.value.args[0]
+
+    assert result["window"] == dict(start=0, end=2000, seconds=2000)
+    assert result["results"]["a"]["uptime_percent"] == 75.0
+    assert result["results"]["a"]["mttr_seconds"] == 500.0
+    assert result["results"]["b"]["uptime_percent"] == 0.0
+    assert result["results"]["fail"]["failed"]
+    assert "/checks/a/flips/?start=0&end=2000" in stand_in.hits
+    assert result["msg"] == "Failed to get the flips of 1 of 3 checks"
+
+
+def test_flips_are_exported_to_a_file(stand_in, tmp_path):
+    def flip(ts, up):
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(ts))
+        return dict(timestamp=timestamp, up=up, ts=ts)
+
+    stand_in.flips = dict(a=[flip(100, 0), flip(200, 1)], b=[flip(150, 0)])
+
+    def export(**params):
+        module = FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+            management_api_token="token",
+            token_validation="none",
+            retries=0,
+            parallelism=4,
+            **params,
+        )
+        with pytest.raises(ExitJson) as result:
+            healthchecksio.ChecksFlipsInfo(module).get()
+        return result.value.args[0]
+
+    dest = tmp_path / "flips.jsonl"
+    state_file = str(tmp_path / "state.json")
+    result = export(uuids=["a", "b"], dest=str(dest), state_file=state_file)
+    assert result["records"] == 3
+    assert result["results"]["a"] == dict(failed=False, status_code=200, records=2)
+    assert "data" not in result["results"]["a"]
+    records = [json.loads(line) for line in dest.read_text().splitlines()]
+    assert sorted((r["uuid"], r["ts"]) for r in records) == [
+        ("a", 100),
+        ("a", 200),
+        ("b", 150),
+    ]
+
+    # The state file applies to exports too
+    stand_in.flips["a"].append(flip(300, 0))
+    result = export(uuids=["a", "b"], dest=str(dest), state_file=state_file)
+    assert result["records"] == 1
+    assert json.load(open(state_file))["checks"]["a"] == 300
+
+    dest = tmp_path / "flips.csv"
+    result = export(uuid="b", dest=str(dest), format="csv")
+    assert dest.read_text().splitlines() == [
+        "uuid,timestamp,up",
+        "b,1970-01-01T00:02:30+00:00,0",
+    ]
+    assert result["msg"] == "Wrote 1 flips of 1 checks to {0}".format(dest)
+
+    # A single check that cannot be fetched fails and leaves no file behind
+    with pytest.raises(FailJson):
+        module = FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(stand_in.server_port),
+            management_api_token="token",
+            token_validation="none",
+            retries=0,
+            uuid="fail",
+            dest=str(tmp_path / "pings.jsonl"),
+        )
+        healthchecksio.ChecksPingsInfo(module).get()
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "flips.csv",
+        "flips.jsonl",
+        "state.json",
+    ]
+
+
+def make_checks(server, cls=None, **params):
+    module = FakeModule(
+        management_api_base_url="http://127.0.0.1:{0}".format(server.server_port),
+        management_api_token="token",
+        token_validation="none",
+        **params,
+    )
+    return (cls or healthchecksio.Checks)(module)
+
+
+def test_existing_checks_are_found_by_unique_fields(stand_in):
+    stand_in.checks = [
+        dict(
+            name="web",
+            desc="",
+            timeout=60,
+            tags="prod web",
+            channels="c1,c2",
+            ping_url="https://hc-ping.com/a",
+        ),
+        dict(name="db", desc="", timeout=60, tags="", channels=""),
+        dict(name="dup", desc="", timeout=60, tags="", channels=""),
+        dict(name="dup", desc="", timeout=60, tags="", channels=""),
+    ]
+    stand_in.channels = [dict(id="c1"), dict(id="c2")]
+    checks = make_checks(stand_in)
+
+    def find(**changes):
+        request_params = dict(
+            name="web",
+            desc="",
+            timeout=60,
+            tags="prod web",
+            channels="c2,c1",
+            unique=["name"],
+        )
+        request_params.update(changes)
+        return checks._find_existing_check(request_params)
+
+    # The order of the channels does not matter, the rest must be the same
+    assert find()["ping_url"] == "https://hc-ping.com/a"
+    assert find(channels="*")["ping_url"] == "https://hc-ping.com/a"
+    assert find(name="db", tags="", channels="")["name"] == "db"
+    assert find(name="nope") is None
+    assert find(desc="changed") is None
+    assert find(tags="web prod") is None
+    assert find(channels="c1") is None
+    assert find(timeout=120) is None
+
+    with pytest.raises(FailJson) as error:
+        find(name="dup", tags="", channels="")
+    assert error.value.args[0]["msg"] == (
+        "Expected to find one check matching unique parameters, 2 found"
+    )
+    # Without unique fields nothing is matched
+    assert find(unique=[]) is None
+
+    # One listing of the checks and of the channels for all the lookups
+    assert stand_in.hits == ["/checks/", "/channels"]
+
+
+def test_create_only_posts_changed_checks(stand_in):
+    stand_in.checks = [
+        dict(name="web", timeout=60, tags="", channels="", ping_url="x/a"),
+    ]
+
+    def create(**params):
+        checks = make_checks(
+            stand_in,
+            name=params.pop("name", "web"),
+            timeout=params.pop("timeout", 60),
+            schedule=None,
+            tz=None,
+            tags=[],
+            channels="",
+            unique=["name"],
+            **params,
+        )
+        with pytest.raises(ExitJson) as result:
+            checks.create()
+        return result.value.args[0]
+
+    result = create()
+    assert not result["changed"]
+    assert result["uuid"] == "a"
+    assert stand_in.hits == ["/checks/"]
+
+    result = create(name="api")
+    assert result["changed"]
+    assert result["msg"] == "New check new-api created"
+    assert stand_in.hits[-1] == "/checks/"
+    assert json.loads(stand_in.bodies["/checks/"])["unique"] == ["name"]
+
+
+def test_bulk_plan_and_reconcile(stand_in):
+    def check(uuid, name, timeout=60, tags="prod"):
+        return dict(
+            name=name,
+            desc="",
+            timeout=timeout,
+            tags=tags,
+            channels="",
+            ping_url="https://hc-ping.com/" + uuid,
+        )
+
+    stand_in.checks = [
+        check("a", "web"),
+        check("b", "api"),
+        check("c", "old"),
+        check("d", "keep", tags="dev"),
+    ]
+
+    def item(name, timeout=60):
+        return dict(
+            name=name,
+            desc="",
+            timeout=timeout,
+            schedule=None,
+            tz=None,
+            tags=["prod"],
+            channels="",
+        )
+
+    def reconcile(items, check_mode=False, outcome=ExitJson):
+        bulk = make_checks(
+            stand_in,
+            cls=healthchecksio.ChecksBulk,
+            checks=items,
+            unique=["name"],
+            purge=True,
+            purge_tags=["prod"],
+            parallelism=4,
+            fail_fast=False,
+        )
+        bulk.module.check_mode = check_mode
+        with pytest.raises(outcome) as result:
+            bulk.reconcile()
+        return result.value.args[0]
+
+    items = [item("web"), item("api", timeout=120), item("new")]
+    result = reconcile(items + [item("web")], check_mode=True, outcome=FailJson)
+    assert result["summary"] == dict(
+        created=1, updated=1, unchanged=1, deleted=1, failed=1, skipped=0
+    )
+    assert [(r["name"], r["action"]) for r in result["results"]] == [
+        ("web", "unchanged"),
+        ("api", "updated"),
+        ("new", "created"),
+        ("web", "failed"),
+        ("old", "deleted"),
+    ]
+    assert result["results"][3]["msg"] == (
+        "Another item already uses the same unique parameters"
+    )
+    assert stand_in.hits == ["/checks/"]
+
+    result = reconcile(items)
+    assert result["changed"]
+    assert result["msg"] == (
+        "1 created, 1 updated, 1 unchanged, 1 deleted, 0 failed, 0 skipped"
+    )
+    assert sorted(stand_in.hits[2:]) == ["/checks/", "/checks/b", "/checks/c"]
+    assert [r["uuid"] for r in result["results"]] == ["a", "b", "new-new", "c"]
+    # Updates go to the check itself, only creates are matched on unique
+    assert "unique" not in json.loads(stand_in.bodies["/checks/b"])
+    assert json.loads(stand_in.bodies["/checks/"])["unique"] == ["name"]
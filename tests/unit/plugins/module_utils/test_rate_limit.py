@@ -0,0 +1,154 @@
+"""Rate limiter benchmark against a throttling stand-in server.
+
+Run directly to print the numbers, for example with more forks:
+
+    python tests/unit/plugins/module_utils/test_rate_limit.py 16 40
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import multiprocessing
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+healthchecksio = pytest.importorskip(
+    "ansible_collections.community.healthchecksio.plugins.module_utils.healthchecksio"
+)
+from ansible_collections.community.healthchecksio.tests.unit.plugins.stand_in import (
+    serve,
+)  # noqa: E402
+
+SERVER_RATE = 40.0
+SERVER_BURST = 5
+
+
+class FakeModule(object):
+    def __init__(self, **params):
+        self.params = params
+        self.tmpdir = None
+        self.check_mode = False
+
+    def jsonify(self, data):
+        return json.dumps(data)
+
+    def debug(self, msg):
+        pass
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers 429 once more than SERVER_RATE requests per second come in."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            now = time.time()
+            tokens = min(
+                SERVER_BURST,
+                self.server.tokens + (now - self.server.updated) * SERVER_RATE,
+            )
+            self.server.updated = now
+            status = 200 if tokens >= 1 else 429
+            self.server.tokens = tokens - 1 if status == 200 else tokens
+        body = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def fork(port, requests, rate_limit, rate_limit_dir, results):
+    helper = healthchecksio.HealthchecksioHelper(
+        FakeModule(
+            management_api_base_url="http://127.0.0.1:{0}".format(port),
+            management_api_token="token",
+            token_validation="none",
+            retries=0,
+            keep_alive=True,
+            rate_limit=rate_limit,
+            rate_limit_dir=rate_limit_dir,
+        )
+    )
+    statuses = [helper.get("checks/").status_code for dummy in range(requests)]
+    results.put(statuses)
+
+
+def benchmark(forks, requests, rate_limit, rate_limit_dir):
+    """Return (successful requests per second, number of 429 answers)."""
+    with serve(
+        ThrottlingHandler,
+        lock=threading.Lock(),
+        tokens=SERVER_BURST,
+        updated=time.time(),
+    ) as server:
+        statuses, elapsed = run_forks(
+            server, forks, requests, rate_limit, rate_limit_dir
+        )
+    return statuses.count(200) / elapsed, statuses.count(429)
+
+
+def run_forks(server, forks, requests, rate_limit, rate_limit_dir):
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=fork,
+            args=(server.server_port, requests, rate_limit, rate_limit_dir, results),
+        )
+        for dummy in range(forks)
+    ]
+    started = time.time()
+    for process in processes:
+        process.start()
+    statuses = []
+    for dummy in processes:
+        statuses.extend(results.get(timeout=60))
+    elapsed = time.time() - started
+    for process in processes:
+        process.join()
+    return statuses, elapsed
+
+
+@pytest.mark.skipif(
+    not healthchecksio.HAS_FCNTL or sys.platform == "win32", reason="needs fork"
+)
+def test_rate_limit_smooths_requests_across_forks(tmp_path):
+    unlimited_rate, unlimited_429 = benchmark(8, 10, 0, str(tmp_path))
+    limited_rate, limited_429 = benchmark(8, 10, SERVER_RATE * 0.9, str(tmp_path))
+
+    print(
+        "\nwithout rate_limit: {0:.1f} req/s, {1} throttled"
+        "\nwith rate_limit:    {2:.1f} req/s, {3} throttled".format(
+            unlimited_rate, unlimited_429, limited_rate, limited_429
+        )
+    )
+    assert unlimited_429 > 0
+    assert limited_429 == 0
+    assert limited_rate <= SERVER_RATE
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    forks = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    directory = tempfile.mkdtemp()
+    for rate_limit in (0, SERVER_RATE * 0.9):
+        rate, throttled = benchmark(forks, requests, rate_limit, directory)
+        print(
+            "rate_limit={0:<5} {1:6.1f} successful req/s, {2} of {3} throttled".format(
+                rate_limit, rate, throttled, forks * requests
+            )
+        )
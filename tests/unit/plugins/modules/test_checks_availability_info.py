@@ -0,0 +1,7 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+def test_checks_availability_info_placeholder():
+    assert True
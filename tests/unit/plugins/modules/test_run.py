@@ -0,0 +1,7 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+def test_run_placeholder():
+    assert True
@@ -0,0 +1,62 @@
+"""Local HTTP servers standing in for the Healthchecks.io APIs in unit tests."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import contextlib
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ChecksHandler(BaseHTTPRequestHandler):
+    """Answers "/checks/" with ``server.checks`` as the listing."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        body = json.dumps({"checks": self.server.checks}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(handler, **attributes):
+    """Serve ``handler`` on a free local port from a daemon thread.
+
+    The keyword arguments are set on the server, for the handler to read.
+    """
+    server = StandInServer(("127.0.0.1", 0), handler)
+    for name, value in attributes.items():
+        setattr(server, name, value)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
+
+
+@contextlib.contextmanager
+def serve(handler, **attributes):
+    server = start(handler, **attributes)
+    try:
+        yield server
+    finally:
+        stop(server)